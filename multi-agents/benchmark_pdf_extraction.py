@@ -0,0 +1,58 @@
+"""
+Benchmark: serial PDF text extraction (previous CVFetcher path) vs PDFExtractionPool.
+
+Usage: python benchmark_pdf_extraction.py [num_cvs] [pages_per_cv]
+"""
+
+import os
+import sys
+import time
+import fitz
+from src.utils.pdf_extraction import PDFExtractionPool
+
+
+def make_cv(pages: int) -> bytes:
+    """Build a synthetic text PDF of `pages` pages."""
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        lines = "\n".join(f"Experience {i}.{j}: java, spring boot, docker, kubernetes, postgresql" for j in range(50))
+        page.insert_text((40, 40), lines, fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def serial_extract(pdf_bytes: bytes) -> str:
+    # Ancienne implémentation de CVFetcher._extract_text
+    text = ""
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        for page in doc:
+            text += page.get_text()
+    return text
+
+
+def main():
+    num_cvs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    cvs = [make_cv(pages) for _ in range(num_cvs)]
+    print(f"{num_cvs} CVs x {pages} pages, {os.cpu_count()} CPUs")
+
+    start = time.perf_counter()
+    for cv in cvs:
+        serial_extract(cv)
+    serial = time.perf_counter() - start
+    print(f"serial:            {serial:.2f}s")
+
+    for workers in sorted({2, 4, os.cpu_count() or 1}):
+        for ordered in (True, False):
+            start = time.perf_counter()
+            with PDFExtractionPool(workers=workers, ordered=ordered) as pool:
+                count = sum(1 for _ in pool.map(enumerate(cvs)))
+            elapsed = time.perf_counter() - start
+            label = "ordered" if ordered else "as-completed"
+            print(f"pool x{workers:<2} {label:<12}: {elapsed:.2f}s  (x{serial / elapsed:.1f}, {count} CVs)")
+
+
+if __name__ == "__main__":
+    main()
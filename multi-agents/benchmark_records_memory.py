@@ -0,0 +1,66 @@
+"""
+Benchmark: memory and (de)serialization time of candidate profiles as nested dicts
+(current pipeline format) vs CandidateRecord.
+
+Usage: python benchmark_records_memory.py [num_candidates]
+"""
+
+import json
+import random
+import sys
+import time
+import tracemalloc
+from src.utils.records import CandidateRecord, dumps, load_candidates
+
+SKILLS = ["java", "spring boot", "postgresql", "docker", "kubernetes", "kafka", "python", "react",
+          "aws", "git", "ci/cd", "mongodb", "rest api", "maven", "scrum", "angular", "sql", "linux"]
+
+
+def make_candidate(i: int) -> dict:
+    rng = random.Random(i)
+    return {
+        "candidate_id": f"{i:024x}",
+        "entities": {
+            "FNAME": [f"Prenom{i}"],
+            "LNAME": [f"Nom{i}"],
+            "EMAIL": [f"candidat{i}@example.com"],
+            "HSKILL": rng.sample(SKILLS, 10),
+            "SSKILL": rng.sample(["communication", "teamwork", "leadership", "autonomy", "rigor"], 3),
+            "EXPERIENCE": [f"Développeur backend chez Entreprise {i % 50}, 2019 - 2023"],
+            "EDUCATION": ["Diplôme d'ingénieur d'Etat en informatique"],
+        }
+    }
+
+
+def measure(build):
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+    # Mémoire mesurée séparément : tracemalloc ralentit fortement la construction
+    tracemalloc.start()
+    data = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return data, size, elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    raw = json.dumps([make_candidate(i) for i in range(n)])
+
+    dicts, dict_bytes, dict_load = measure(lambda: json.loads(raw))
+    records, record_bytes, record_load = measure(lambda: load_candidates(raw.encode("utf-8")))
+    print(f"{n} candidats")
+    print(f"dicts   : {dict_bytes / 1e6:7.1f} MB  chargement {dict_load:.2f}s")
+    print(f"records : {record_bytes / 1e6:7.1f} MB  chargement {record_load:.2f}s  (x{dict_bytes / record_bytes:.1f} moins de mémoire)")
+
+    start = time.perf_counter()
+    json.dumps(dicts)
+    print(f"json.dumps(dicts)   : {time.perf_counter() - start:.2f}s")
+    start = time.perf_counter()
+    dumps(records)
+    print(f"dumps(records)      : {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
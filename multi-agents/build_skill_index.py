@@ -0,0 +1,76 @@
+"""
+Backfill of the inverted skill index with the existing candidate base and job offers.
+
+Candidates and offers already indexed are skipped, so the script can be re-run to catch up.
+CVs go through the same steps as the pipeline (bulk GridFS read, PDF extraction, entity
+extraction with its caches), BATCH candidates at a time.
+
+Usage: python build_skill_index.py [batch_size]
+"""
+
+import sys
+from bson import ObjectId
+from src.tools.cv_entity_extractor import CVEntityExtractor
+from src.tools.job_offer_entity_extractor import JobOfferEntityExtractor
+from src.utils.gridfs_bulk import fetch_gridfs_files
+from src.utils.mongo_client import get_database
+from src.utils.pdf_extraction import PDFExtractionPool
+from src.utils.skill_index import CANDIDATE, OFFER, get_skill_index
+
+
+def index_offers(db, index):
+    done = index.indexed_ids(OFFER)
+    extractor = JobOfferEntityExtractor()
+    for offer in db['offre'].find({}, {"description": 1, "updatedAt": 1}):
+        if str(offer["_id"]) in done or not offer.get("description"):
+            continue
+        try:
+            extractor._run({"id": str(offer["_id"]), "description": offer["description"],
+                            "updated_at": offer.get("updatedAt")})
+        except Exception as e:
+            print(f"Offre {offer['_id']} ignorée: {e}")
+
+
+def index_candidates(db, index, batch_size):
+    done = index.indexed_ids(CANDIDATE)
+    extractor = CVEntityExtractor()
+    cursor = db['candidat'].find({"cv_file_id": {"$nin": [None, ""]}}, {"cv_file_id": 1})
+    batch = []
+    with PDFExtractionPool() as pool:
+        for candidate in cursor:
+            if str(candidate["_id"]) not in done and ObjectId.is_valid(str(candidate["cv_file_id"])):
+                batch.append(candidate)
+            if len(batch) >= batch_size:
+                _index_batch(db, pool, extractor, batch)
+                batch = []
+        if batch:
+            _index_batch(db, pool, extractor, batch)
+
+
+def _index_batch(db, pool, extractor, batch):
+    # Plusieurs candidats peuvent partager le même fichier CV
+    files = {}
+    for c in batch:
+        files.setdefault(ObjectId(str(c["cv_file_id"])), []).append(str(c["_id"]))
+    contents, errors = fetch_gridfs_files(db, files.keys())
+    cvs = []
+    for file_id, text, error in pool.map((file_id, contents.get(file_id)) for file_id in files):
+        if text:
+            cvs.extend({"candidate_id": candidate_id, "text": text} for candidate_id in files[file_id])
+    print(f"Index compétences - {len(cvs)}/{len(batch)} CVs lus ({len(errors)} erreurs GridFS)")
+    if cvs:
+        try:
+            extractor._run(cvs)
+        except Exception as e:
+            print(f"Lot ignoré: {e}")
+
+
+if __name__ == "__main__":
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    db = get_database()
+    index = get_skill_index()
+    if index is None:
+        sys.exit("SKILL_INDEX_ENABLED=false : rien à construire")
+    index_offers(db, index)
+    index_candidates(db, index, batch_size)
+    print("Index compétences:", index.stats())
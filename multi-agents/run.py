@@ -1,6 +1,16 @@
 from src.crew.crew_initializer import crew
+from src.config.settings import CV_INCREMENTAL_MODE
+from src.utils.postulation_tracker import commit_processed
+from src.utils.http_client import latency_stats
+from src.utils.resilience import default_policy
+from src.utils.mongo_client import pool_metrics
 
 if __name__ == "__main__":
     result = crew.kickoff()
     print(" Crew execution completed.")
-    print(result)
\ No newline at end of file
+    print(result)
+    if CV_INCREMENTAL_MODE:
+        print("Postulations marquées comme traitées:", commit_processed())
+    print("Latence des APIs:", latency_stats.snapshot())
+    print("Résilience des APIs:", default_policy.snapshot())
+    print("Pool MongoDB:", pool_metrics.snapshot())
@@ -1,5 +1,7 @@
 from crewai import Agent
 from src.config.llm_config import llm
+from src.tools.candidate_scoring_tool import CandidateScorer
+from src.tools.skill_match_tool import SkillMatchFinder
 
 
 cv_ranker_agent = Agent(
@@ -7,6 +9,6 @@ cv_ranker_agent = Agent(
     goal="Classify candidates into Tier 1, 2 or 3.",
     backstory="You use objective criteria to classify CVs based on extracted scores.",
     llm=llm,
-    tools=[],
+    tools=[CandidateScorer(), SkillMatchFinder()],
     verbose=True
 )
\ No newline at end of file
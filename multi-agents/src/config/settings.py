@@ -33,4 +33,124 @@ QDRANT_URL = os.getenv("QDRANT_URL")
 
 MONGO_URI = os.getenv("MONGO_URI")
 MAX_CVS = int(os.getenv("MAX_CVS"))
-AGENTOPS_API_KEY = os.getenv("AGENTOPS_API_KEY")
\ No newline at end of file
+AGENTOPS_API_KEY = os.getenv("AGENTOPS_API_KEY")
+
+# Lecture des CVs en streaming (CV_STREAM_MAX_IN_FLIGHT = lots GridFS lus en avance)
+CV_STREAM_MAX_IN_FLIGHT = int(os.getenv("CV_STREAM_MAX_IN_FLIGHT", 4))
+CV_STREAM_BATCH_SIZE = int(os.getenv("CV_STREAM_BATCH_SIZE", 100))
+CV_SORT_FIELD = os.getenv("CV_SORT_FIELD", "createdAt")
+CV_SORT_ORDER = int(os.getenv("CV_SORT_ORDER", 1))  # 1 = plus anciennes d'abord, -1 = plus récentes
+
+# Extraction du texte des PDFs (0 ou 1 = extraction dans le thread appelant)
+PDF_EXTRACTION_WORKERS = int(os.getenv("PDF_EXTRACTION_WORKERS", os.cpu_count() or 1))
+PDF_EXTRACTION_CHUNK_SIZE = int(os.getenv("PDF_EXTRACTION_CHUNK_SIZE", 4))
+PDF_EXTRACTION_ORDERED = os.getenv("PDF_EXTRACTION_ORDERED", "true").lower() == "true"
+
+# Cache disque du texte extrait des CVs
+CV_TEXT_CACHE_ENABLED = os.getenv("CV_TEXT_CACHE_ENABLED", "true").lower() == "true"
+CV_TEXT_CACHE_PATH = os.getenv("CV_TEXT_CACHE_PATH", "data/cache/cv_text.sqlite3")
+CV_TEXT_CACHE_MAX_BYTES = int(os.getenv("CV_TEXT_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+# Client MongoDB partagé
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "recrutement")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 50))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", 0))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", 5000))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", 60000))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 10000))
+
+# Lecture groupée GridFS (un curseur fs.chunks par lot de CVs)
+GRIDFS_BATCH_MAX_FILES = int(os.getenv("GRIDFS_BATCH_MAX_FILES", 50))
+GRIDFS_BATCH_MAX_BYTES = int(os.getenv("GRIDFS_BATCH_MAX_BYTES", 16 * 1024 * 1024))
+
+# Mode incrémental : seules les nouvelles postulations sont traitées puis marquées "traite"
+CV_INCREMENTAL_MODE = os.getenv("CV_INCREMENTAL_MODE", "false").lower() == "true"
+
+# OCR des pages sans couche texte (CVs scannés)
+PDF_OCR_ENABLED = os.getenv("PDF_OCR_ENABLED", "true").lower() == "true"
+PDF_OCR_MAX_PAGES = int(os.getenv("PDF_OCR_MAX_PAGES", 4))  # budget de pages OCR par document
+PDF_OCR_MIN_CHARS = int(os.getenv("PDF_OCR_MIN_CHARS", 10))
+PDF_OCR_DPI = int(os.getenv("PDF_OCR_DPI", 200))
+PDF_OCR_LANG = os.getenv("PDF_OCR_LANG", "fra+eng")
+PDF_OCR_WORKERS = int(os.getenv("PDF_OCR_WORKERS", 2))
+
+# API d'extraction d'entités des CVs (envoi par lots)
+CV_NER_API_URL = os.getenv("CV_NER_API_URL", "http://127.0.0.1:5004/extract-info/")
+CV_NER_BATCH_SIZE = int(os.getenv("CV_NER_BATCH_SIZE", 16))
+CV_NER_BATCH_CHARS = int(os.getenv("CV_NER_BATCH_CHARS", 60000))
+CV_NER_MAX_IN_FLIGHT = int(os.getenv("CV_NER_MAX_IN_FLIGHT", 4))
+CV_NER_TIMEOUT = float(os.getenv("CV_NER_TIMEOUT", 60))
+
+# Client HTTP partagé pour les APIs internes
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 20))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 60))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+OFFER_NER_API_URL = os.getenv("OFFER_NER_API_URL", "http://127.0.0.1:5000/predict")
+
+# Cache des entités extraites (invalidé quand la version du modèle change)
+ENTITY_CACHE_ENABLED = os.getenv("ENTITY_CACHE_ENABLED", "true").lower() == "true"
+ENTITY_CACHE_PATH = os.getenv("ENTITY_CACHE_PATH", "data/cache/entities.sqlite3")
+ENTITY_CACHE_MAX_BYTES = int(os.getenv("ENTITY_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+ENTITY_CACHE_TTL = float(os.getenv("ENTITY_CACHE_TTL", 30 * 24 * 3600))  # secondes, 0 = sans expiration
+CV_NER_MODEL_VERSION = os.getenv("CV_NER_MODEL_VERSION", "1")
+OFFER_NER_MODEL_VERSION = os.getenv("OFFER_NER_MODEL_VERSION", "1")
+
+# Backend d'extraction d'entités : "http" (APIs Flask) ou "inprocess" (modèle chargé dans le processus)
+NER_BACKEND = os.getenv("NER_BACKEND", "http")
+CV_NER_INPROCESS_MODEL = os.getenv("CV_NER_INPROCESS_MODEL")  # "module:fabrique", ex: "ner_service.model:load_cv_model"
+OFFER_NER_INPROCESS_MODEL = os.getenv("OFFER_NER_INPROCESS_MODEL")
+
+# Découpage des CVs longs avant extraction d'entités (0 = pas de découpage)
+CV_NER_MAX_TOKENS = int(os.getenv("CV_NER_MAX_TOKENS", 400))
+CV_NER_TOKENS_PER_WORD = float(os.getenv("CV_NER_TOKENS_PER_WORD", 1.3))
+
+# Vocabulaire canonique des compétences (alias -> compétence)
+SKILL_ALIASES_PATH = os.getenv(
+    "SKILL_ALIASES_PATH", os.path.join(os.path.dirname(__file__), "skill_aliases.json")
+)
+
+# Résilience des appels aux APIs (délais, reprises, requêtes doublées, disjoncteur)
+HTTP_DEADLINE = float(os.getenv("HTTP_DEADLINE", 180))  # secondes, toutes tentatives comprises
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 2))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", 0.2))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", 5))
+HTTP_HEDGE_ENABLED = os.getenv("HTTP_HEDGE_ENABLED", "false").lower() == "true"
+HTTP_HEDGE_QUANTILE = float(os.getenv("HTTP_HEDGE_QUANTILE", 0.95))
+HTTP_HEDGE_MIN_SAMPLES = int(os.getenv("HTTP_HEDGE_MIN_SAMPLES", 20))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", 30))
+
+# Format des échanges avec les services NER : "json" ou "msgpack", compression "none", "gzip" ou "zstd"
+NER_WIRE_ENCODING = os.getenv("NER_WIRE_ENCODING", "json")
+NER_WIRE_COMPRESSION = os.getenv("NER_WIRE_COMPRESSION", "none")
+NER_WIRE_COMPRESSION_MIN_BYTES = int(os.getenv("NER_WIRE_COMPRESSION_MIN_BYTES", 1024))
+
+# Barème de classement déterministe (poids relatifs des 4 critères)
+SCORE_WEIGHT_HARD_SKILLS = float(os.getenv("SCORE_WEIGHT_HARD_SKILLS", 0.4))
+SCORE_WEIGHT_SOFT_SKILLS = float(os.getenv("SCORE_WEIGHT_SOFT_SKILLS", 0.15))
+SCORE_WEIGHT_EXPERIENCE = float(os.getenv("SCORE_WEIGHT_EXPERIENCE", 0.3))
+SCORE_WEIGHT_EDUCATION = float(os.getenv("SCORE_WEIGHT_EDUCATION", 0.15))
+
+# Correspondance sémantique des compétences (embeddings)
+SKILL_EMBEDDINGS_ENABLED = os.getenv("SKILL_EMBEDDINGS_ENABLED", "false").lower() == "true"
+SKILL_EMBEDDINGS_PATH = os.getenv("SKILL_EMBEDDINGS_PATH", "data/cache/skill_embeddings.npz")
+SKILL_SIMILARITY_THRESHOLD = float(os.getenv("SKILL_SIMILARITY_THRESHOLD", 0.8))
+
+# Classement en deux étapes : seuls les K premiers du pré-classement passent par le LLM (0 = jamais)
+RANK_LLM_TOP_K = int(os.getenv("RANK_LLM_TOP_K", CANDIDATES_NUMBER))
+
+# Candidats extraits par offre, relus par l'outil de classement
+APPLICANT_STORE_PATH = os.getenv("APPLICANT_STORE_PATH", "data/cache/applicants.sqlite3")
+
+# Index de classement persistant par offre (seuls les nouveaux candidats sont notés)
+RANKING_INDEX_ENABLED = os.getenv("RANKING_INDEX_ENABLED", "true" if CV_INCREMENTAL_MODE else "false").lower() == "true"
+RANKING_INDEX_PATH = os.getenv("RANKING_INDEX_PATH", "data/cache/ranking.sqlite3")
+
+# Index inversé compétence -> candidats / offres
+SKILL_INDEX_ENABLED = os.getenv("SKILL_INDEX_ENABLED", "true").lower() == "true"
+SKILL_INDEX_PATH = os.getenv("SKILL_INDEX_PATH", "data/cache/skill_index.sqlite3")
+SKILL_INDEX_TOP_K = int(os.getenv("SKILL_INDEX_TOP_K", 20))
+# Recherche de candidats non postulants en fin de run (tâche supplémentaire, désactivée par défaut)
+TALENT_POOL_ENABLED = os.getenv("TALENT_POOL_ENABLED", "false").lower() == "true"
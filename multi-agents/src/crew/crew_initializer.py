@@ -9,6 +9,8 @@ from src.tasks.cv_task import cv_task
 from src.tasks.rank_task import rank_task
 from src.tasks.quiz_generator_task import quiz_task
 from src.tasks.form_distribution_task import form_distribution_task
+from src.tasks.talent_pool_task import talent_pool_task
+from src.config.settings import TALENT_POOL_ENABLED
 
 
 crew = Crew(
@@ -25,7 +27,7 @@ crew = Crew(
         rank_task,
         quiz_task,
         form_distribution_task
-    ],
+    ] + ([talent_pool_task] if TALENT_POOL_ENABLED else []),
     process=Process.sequential,
 )
 
@@ -7,11 +7,13 @@ from .cv_task import cv_task
 from .rank_task import rank_task
 from .quiz_generator_task import quiz_task
 from .form_distribution_task import form_distribution_task
+from .talent_pool_task import talent_pool_task
 
 __all__ = [
     'job_offer_task',
     'cv_task',
     'rank_task', 
     'quiz_task',
-    'form_distribution_task'
+    'form_distribution_task',
+    'talent_pool_task'
 ]
\ No newline at end of file
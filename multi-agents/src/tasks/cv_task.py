@@ -18,7 +18,7 @@ cv_task = Task(
         "STEP 2: Extract Structured Information From CV Text\n"
         "- Use the `CVEntityExtractor` tool to convert each CV's raw text into structured fields.\n"
         "- Required fields per candidate: `FNAME`, `LNAME`, `EMAIL`, `HSKILL`, `SSKILL`, `EXPERIENCE`, `EDUCATION`.\n"
-        "- Normalize the skill fields: lowercase, split multi-skill strings, deduplicate entries.\n\n"
+        "- Skill fields are returned already normalized to canonical skill names (lowercase, aliases resolved, deduplicated); keep them as-is.\n\n"
 
         "STEP 3: Generate Final Output\n"
         "Final Output Format (JSON):\n"
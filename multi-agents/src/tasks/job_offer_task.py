@@ -13,9 +13,11 @@ job_offer_task = Task(
         "  • 'id' (ObjectId as string)\n"
         "  • 'title' (string)\n"
         "  • 'description' (string)\n"
+        "  • 'updated_at' (string or null)\n"
         "- This job offer ID will be reused in the next stages of the recruitment pipeline .\n\n"
 
         "Step 2: Use the 'Job Offer Entity Extractor' tool to extract structured information from the job description.\n"
+        "- Pass the offer's 'id', 'updated_at' and 'description' so previously extracted entities can be reused.\n"
         "- The API should return the following structured fields: 'hard_skills', 'soft_skills', 'experience', 'education'.\n"
         "- Ensure data normalization:\n"
         "  • Convert all skill/keyword values to lowercase.\n"
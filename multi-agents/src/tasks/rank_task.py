@@ -1,6 +1,8 @@
 from crewai import Task
 from src.agents.cv_ranker_agent import cv_ranker_agent
-from src.config.settings import OUTPUT_CLASSIF_DIR
+from src.tasks.job_offer_task import job_offer_task
+from src.tools.candidate_scoring_tool import CandidateScorer
+from src.config.settings import OUTPUT_CLASSIF_DIR, RANK_LLM_TOP_K
 import os
 
 
@@ -9,52 +11,22 @@ rank_task = Task(
     " **Objective:**\n"
     "Rank up to N job applicants objectively and scientifically based on their alignment with a given job offer.\n\n"
     
-    " **Input JSON Structure:**\n"
-    "{\n"
-    "  'id': <job_offer_id>,\n"
-    "  'title': <job_title>,\n"
-    "  'description': <job_description>,\n"
-    "  'entities': {\n"
-    "     'hard_skills': [...],\n"
-    "     'soft_skills': [...],\n"
-    "     'experience': [...],\n"
-    "     'education': [...]\n"
-    "  },\n"
-    "  'applicants': [\n"
-    "    {\n"
-    "      'FNAME': <first_name>,\n"
-    "      'LNAME': <last_name>,\n"
-    "      'EMAIL': <email>,\n"
-    "      'HSKILL': [...],\n"
-    "      'SSKILL': [...],\n"
-    "      'EXPERIENCE': [...],\n"
-    "      'EDUCATION': [...]\n"
-    "    },\n"
-    "    ...\n"
-    "  ]\n"
-    "}\n\n"
+    " **Input:**\n"
+    "The job offer ID ('offer_id' / 'id') returned by the job offer task. The applicants do not need to be passed: "
+    "the CV Entity Extractor stored them per offer and `CandidateScorer` loads them, together with the offer entities.\n\n"
 
-    " **Scoring Guidelines (Strict Scientific Criteria):**\n"
-    "For each applicant, assign points according to precise matching with job offer requirements:\n"
-    "- **Hard Skills (0-3 points):**\n"
-    "   - 3 = >=80% match | 2 = 50-79% match | 1 = 20-49% match | 0 = <20%\n"
-    "- **Soft Skills (0-3 points):**\n"
-    "   - Same thresholds as above\n"
-    "- **Experience (0-3 points):**\n"
-    "   - Based on direct relevance and duration alignment\n"
-    "- **Education (0-3 points):**\n"
-    "   - Based on level, field relevance, and requirement match\n"
-    "- **Total Score:** Scaled to 0–100% using a weighted sum\n\n"
+    " **Scoring:**\n"
+    "Scoring is done by the `CandidateScorer` tool, which applies the rubric below deterministically:\n"
+    "- **Hard Skills (0-3 points):** 3 = >=80% match | 2 = 50-79% match | 1 = 20-49% match | 0 = <20%\n"
+    "- **Soft Skills (0-3 points):** same thresholds\n"
+    "- **Experience (0-3 points):** duration against the required years and offer skills cited in the experience\n"
+    "- **Education (0-3 points):** degree level against the required level\n"
+    "- **Total Score:** weighted sum scaled to 0–100%; Tier 1: 85–100%, Tier 2: 70–84%, Tier 3: 50–69%, Tier 4: <50%\n"
+    f"The top {RANK_LLM_TOP_K} candidates of this prefilter are then re-scored and summarised by the LLM; the others keep rule-based summaries.\n\n"
 
     " **Steps to Follow:**\n"
-    "1. For each applicant, evaluate all 4 criteria based on overlap with `entities`.\n"
-    "2. Compute the total score and convert to percentage.\n"
-    "3. Assign a **tier**:\n"
-    "   - Tier 1: 85–100%\n"
-    "   - Tier 2: 70–84%\n"
-    "   - Tier 3: 50–69%\n"
-    "   - Tier 4: <50%\n"
-    "4. Sort candidates in **descending order** of total score.\n\n"
+    "1. Call `CandidateScorer` once with `offer_id` only (add `entities` only if the tool reports that none are stored).\n"
+    "2. Return the tool result as-is: it is already sorted by descending score.\n\n"
 
     " **Expected Output (JSON Array):**\n"
     "A valid JSON object with two top-level keys:\n"
@@ -99,5 +71,9 @@ expected_output = (
 ),
 
     agent=cv_ranker_agent,
+    # Seul l'identifiant de l'offre est utile : les candidats sont relus depuis le stockage par offre
+    context=[job_offer_task],
+    # Le résultat de l'outil est la réponse finale : pas de re-saisie du JSON par le LLM
+    tools=[CandidateScorer(result_as_answer=True)],
     output_file=os.path.join(OUTPUT_CLASSIF_DIR, "candidate_scoring_results3.json")
 )
\ No newline at end of file
@@ -0,0 +1,24 @@
+from crewai import Task
+from src.agents.cv_ranker_agent import cv_ranker_agent
+from src.tasks.job_offer_task import job_offer_task
+from src.tools.skill_match_tool import SkillMatchFinder
+from src.config.settings import OUTPUT_CLASSIF_DIR, SKILL_INDEX_TOP_K
+import os
+
+talent_pool_task = Task(
+    description=(
+        "Find candidates from the existing candidate base who fit the job offer but did not apply to it.\n\n"
+        "1. Take the job offer ID from the job offer output.\n"
+        f"2. Call `SkillMatchFinder` once with `offer_id` and top_k={SKILL_INDEX_TOP_K}; the tool leaves out the applicants itself.\n"
+        "3. Return the tool result as-is: candidates are already sorted by skill coverage, then precision.\n\n"
+        "DO NOT invent candidates or skills that the tool did not return."
+    ),
+    expected_output=(
+        "A valid JSON object with 'offer_id' and 'candidates': a list of "
+        "{'id', 'matched', 'coverage', 'precision'} sorted by descending coverage."
+    ),
+    agent=cv_ranker_agent,
+    context=[job_offer_task],
+    tools=[SkillMatchFinder(result_as_answer=True)],
+    output_file=os.path.join(OUTPUT_CLASSIF_DIR, "talent_pool_matches.json")
+)
@@ -7,6 +7,8 @@ from .job_offer_entity_extractor import JobOfferEntityExtractor
 from .cv_fetcher_tool import CVFetcher
 from .cv_entity_extractor import CVEntityExtractor
 from .quiz_generator_tool import QuizGenerationTool
+from .candidate_scoring_tool import CandidateScorer
+from .skill_match_tool import SkillMatchFinder
 from .form.google_form_creator import GoogleFormCreator
 from .form.email_sender import EmailSender
 
@@ -16,6 +18,8 @@ __all__ = [
     'CVFetcher',
     'CVEntityExtractor',
     'QuizGenerationTool',
+    'CandidateScorer',
+    'SkillMatchFinder',
     'GoogleFormCreator',
     'EmailSender'
 ]
\ No newline at end of file
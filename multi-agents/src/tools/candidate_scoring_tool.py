@@ -0,0 +1,70 @@
+from bson import ObjectId
+from crewai.tools import BaseTool
+from src.config.settings import RANK_LLM_TOP_K
+from src.utils.applicant_store import get_applicant_store
+from src.utils.mongo_client import get_database
+from src.utils.offer_entity_store import get_offer_entities
+from src.utils.postulation_tracker import record_scored
+from src.utils.scoring_engine import rank_candidates
+from src.utils.shortlist_review import review_shortlist
+from src.utils.ranking_index import get_ranking_index
+
+
+class CandidateScorer(BaseTool):
+    name: str = "Candidate Scorer"
+    description: str = (
+        "Score, tier and rank the applicants of a job offer with the fixed rubric "
+        "(hard skills, soft skills, experience, education), then refine the top candidates. "
+        "Input: the job offer id only. The applicants extracted by the CV Entity Extractor and "
+        "the offer entities are loaded by the tool; pass `entities` only if the offer has none stored."
+    )
+    llm_top_k: int = RANK_LLM_TOP_K
+
+    def _run(self, offer_id: str, entities: dict = None):
+        job_offer = self._job_offer(offer_id, entities)
+        applicants = get_applicant_store().load(offer_id)
+        print(f"Classement - {len(applicants)} candidats chargés pour l'offre {offer_id}")
+
+        index = get_ranking_index()
+        if index is not None:
+            ranking = self._run_indexed(index, job_offer, applicants)
+        else:
+            # Étape 1 : pré-classement déterministe de tous les candidats
+            ranking = rank_candidates(job_offer, applicants)
+            print(f"Classement - {len(ranking['candidates'])} candidats classés")
+
+            # Étape 2 : le LLM ne voit que les K premiers
+            if self.llm_top_k > 0:
+                top_entities = {a.get("candidate_id"): a["entities"] for a in applicants if "entities" in a}
+                review_shortlist(ranking, top_entities, self.llm_top_k)
+
+        # Seuls les candidats notés sont marqués traités ; les CVs en échec seront relus
+        record_scored(offer_id, [a["candidate_id"] for a in applicants if "entities" in a])
+        return ranking
+
+    def _job_offer(self, offer_id: str, entities: dict = None) -> dict:
+        if not ObjectId.is_valid(str(offer_id)):
+            raise ValueError(f"Invalid job offer id {offer_id!r}.")
+        offer = get_database()['offre'].find_one({"_id": ObjectId(str(offer_id))}, {"title": 1})
+        if not offer:
+            raise ValueError(f"No job offer with id {offer_id!r}.")
+        entities = get_offer_entities(offer_id) or entities
+        if not entities:
+            raise ValueError("No entities stored for this job offer: run the Job Offer Entity Extractor first.")
+        return {"offer_id": str(offer_id), "title": offer.get("title", ""), "entities": entities}
+
+    def _run_indexed(self, index, job_offer: dict, applicants: list):
+        """Only new candidates are scored; the ranking covers every candidate stored for the offer."""
+        index.update(job_offer, applicants)
+        failed = [a for a in applicants if "entities" not in a]
+        ranking = index.ranking(job_offer, failed=failed)
+        print(f"Classement - {len(ranking['candidates'])} candidats classés")
+
+        if self.llm_top_k > 0:
+            offer_id = ranking["job_offer"]["offer_id"]
+            top = [c["candidate_id"] for c in ranking["candidates"][:self.llm_top_k]]
+            reviews = review_shortlist(
+                ranking, index.entities(offer_id, top), self.llm_top_k, reviewed=index.reviewed(offer_id)
+            )
+            index.save_reviews(offer_id, reviews)
+        return ranking
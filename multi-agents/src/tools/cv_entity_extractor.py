@@ -1,5 +1,12 @@
-import requests
 from crewai.tools import BaseTool
+from src.utils.cv_dedup import dedup_cvs, expand_results
+from src.utils.ner_backends import get_ner_backend
+from src.utils.entity_cache import get_entity_cache
+from src.utils.cv_segmentation import segment_text, merge_entities
+from src.utils.skill_vocabulary import get_skill_vocabulary
+from src.utils.skill_index import get_skill_index
+from src.utils.applicant_store import get_applicant_store
+from src.config.settings import CV_NER_MODEL_VERSION
 
 class CVEntityExtractor(BaseTool):
     name: str = "CV Entity Extractor"
@@ -9,29 +16,87 @@ class CVEntityExtractor(BaseTool):
         if not isinstance(cv_data, list) or not all("text" in entry for entry in cv_data):
             raise ValueError("Input must be a list of dictionaries with 'text' keys.")
 
-        texts = [entry["text"] for entry in cv_data]
+        # Un même CV (même PDF ou même texte) n'est envoyé qu'une fois à l'API
+        unique, groups = dedup_cvs(cv_data)
+        if len(unique) < len(cv_data):
+            print(f"CVs - Doublons ignorés: {len(cv_data) - len(unique)} sur {len(cv_data)}")
+        texts = [entry["text"] for entry in unique]
 
-        try:
-            response = requests.post("http://127.0.0.1:5004/extract-info/", json={"texts": texts})
-            response.raise_for_status()
-            extracted_info = response.json().get("extracted_info", [])
-        except Exception as e:
-            raise RuntimeError(f"Error contacting CV entity API: {e}")
+        extracted_info = self._extract(texts)
+        if texts and all("error" in extracted for extracted in extracted_info):
+            raise RuntimeError(extracted_info[0]["error"])
 
-        def normalize(skills):
-            return list(set(skill.strip().lower() for group in skills for skill in group.split()))
+        # Compétences ramenées au vocabulaire canonique ("k8s" -> "kubernetes", "spring boot" reste entier)
+        normalize = get_skill_vocabulary().canonical_names
 
-        results = []
-        for original, extracted in zip(cv_data, extracted_info):
-            if 'HSKILL' in extracted:
-                extracted['HSKILL'] = normalize(extracted['HSKILL'])
-            if 'SSKILL' in extracted:
-                extracted['SSKILL'] = normalize(extracted['SSKILL'])
+        for extracted in extracted_info:
+            if 'error' in extracted:
+                continue
+            for field in ('HSKILL', 'SSKILL'):
+                if field in extracted:
+                    extracted[field] = normalize(extracted[field])
 
+        results = []
+        for index, extracted in expand_results(groups, extracted_info):
+            if 'error' in extracted:
+                results.append({
+                    "candidate_id": cv_data[index].get("candidate_id"),
+                    "error": extracted["error"]
+                })
+                continue
             results.append({
-                "candidate_id": original.get("candidate_id"),
-                "entities": extracted
+                "candidate_id": cv_data[index].get("candidate_id"),
+                "entities": dict(extracted)
             })
 
+        # Vivier de candidats interrogeable par compétence, toutes offres confondues
+        index = get_skill_index()
+        if index is not None:
+            updated = sum(
+                index.add_candidate(r["candidate_id"], r["entities"].get("HSKILL") or [])
+                for r in results if "entities" in r and r["candidate_id"] is not None
+            )
+            print(f"CVs - Index compétences: {updated} candidats mis à jour")
+
+        # Le classement relit les candidats par offre : le LLM n'a pas à les recopier
+        stored = get_applicant_store().save_extracted(results)
+        print(f"CVs - Candidats enregistrés par offre: {stored}")
+
         print("CVs - Entités extraites:", results)
         return results
+
+    def _extract(self, texts):
+        """Entities per text, from the entity cache when possible, otherwise from the NER backend."""
+        backend = get_ner_backend()
+        cache = get_entity_cache(backend.cv_name, CV_NER_MODEL_VERSION)
+        extracted_info = cache.get_many(texts) if cache is not None else [None] * len(texts)
+        missing = [i for i, extracted in enumerate(extracted_info) if extracted is None]
+        if cache is not None:
+            print(f"CVs - Cache entités: {len(texts) - len(missing)}/{len(texts)} trouvées")
+
+        fresh = self._extract_segmented(backend, [texts[i] for i in missing]) if missing else []
+        for i, extracted in zip(missing, fresh):
+            if cache is not None and "error" not in extracted:
+                cache.set(texts[i], extracted)
+            extracted_info[i] = extracted
+        return extracted_info
+
+    def _extract_segmented(self, backend, texts):
+        """Split long CVs into token-bounded chunks, extract all chunks in one batch and merge per CV."""
+        chunks, owners = [], []
+        for i, text in enumerate(texts):
+            for chunk in segment_text(text):
+                chunks.append(chunk)
+                owners.append(i)
+
+        parts = [[] for _ in texts]
+        errors = [None] * len(texts)
+        for owner, extracted in zip(owners, backend.extract_cvs(chunks)):
+            if "error" in extracted:
+                errors[owner] = extracted["error"]
+            else:
+                parts[owner].append(extracted)
+
+        # Un CV dont une partie a échoué garde les entités des autres parties
+        return [merge_entities(p) if p else {"error": e} for p, e in zip(parts, errors)]
+
@@ -1,54 +1,232 @@
-import fitz
-import gridfs
-from pymongo import MongoClient
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from bson import ObjectId
 from crewai.tools import BaseTool
-from src.config.settings import MONGO_URI, MAX_CVS
+from src.config.settings import (
+    MAX_CVS, CV_STREAM_MAX_IN_FLIGHT, CV_STREAM_BATCH_SIZE,
+    GRIDFS_BATCH_MAX_FILES, GRIDFS_BATCH_MAX_BYTES, CV_INCREMENTAL_MODE,
+    PDF_EXTRACTION_WORKERS, PDF_EXTRACTION_CHUNK_SIZE, PDF_EXTRACTION_ORDERED
+)
+from src.utils.cv_query_planner import CVQueryPlan
+from src.utils.gridfs_bulk import fetch_gridfs_files
+from src.utils.mongo_client import get_database
+from src.utils.postulation_tracker import record_fetched
+from src.utils.applicant_store import get_applicant_store
+from src.utils.pdf_extraction import PDFExtractionPool, extract_pdf_text, process_pool
+from src.utils.cv_text_cache import get_cv_text_cache, cv_text_cache_key
+from src.utils.cv_dedup import content_hash
 
 class CVFetcher(BaseTool):
     name: str = "CV Fetcher"
     description: str = "Fetches CVs of applicants based on job offer ID and extracts text from PDFs."
+    max_in_flight: int = CV_STREAM_MAX_IN_FLIGHT
+    batch_size: int = CV_STREAM_BATCH_SIZE
+    gridfs_batch_files: int = GRIDFS_BATCH_MAX_FILES
+    gridfs_batch_bytes: int = GRIDFS_BATCH_MAX_BYTES
+    extraction_workers: int = PDF_EXTRACTION_WORKERS
+    extraction_chunk_size: int = PDF_EXTRACTION_CHUNK_SIZE
+    ordered_results: bool = PDF_EXTRACTION_ORDERED
+    incremental: bool = CV_INCREMENTAL_MODE
 
     def _run(self, offer_id: str):
-        client = MongoClient(MONGO_URI)
-        db = client['recrutement']
-        fs = gridfs.GridFS(db)
+        return list(self.iter_cvs(offer_id, limit=MAX_CVS))
 
-        # Ne récupérer que les postulations non traitées
-        postulations = list(db['postulation'].find({
-            "id_offre": ObjectId(offer_id),
-            "traite": False
-        }))
-        candidate_ids = [p["id_candidat"] for p in postulations]
+    async def _arun(self, offer_id: str):
+        return [cv async for cv in self.aiter_cvs(offer_id, limit=MAX_CVS)]
 
-        # Récupérer les candidats correspondants
-        candidates = db['candidat'].find({"_id": {"$in": candidate_ids}})
+    def iter_cvs(self, offer_id: str, limit: int = None):
+        """Yield applicants one at a time, with at most `max_in_flight` GridFS batches read ahead."""
+        db = get_database()
+        candidates = self._plan(offer_id, limit).execute(db, batch_size=self.batch_size)
+        get_applicant_store().reset(offer_id)
 
-        results = []
-        for c in candidates:
-            cv_id = c.get("cv_file_id")
-            if not cv_id:
-                continue
+        cache = get_cv_text_cache()
+        extraction = PDFExtractionPool(
+            workers=self.extraction_workers,
+            chunk_size=self.extraction_chunk_size,
+            ordered=self.ordered_results
+        )
+        extraction.start()
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as io_pool, extraction:
+            downloads = self._iter_downloads(io_pool, db, candidates, cache)
+            for (c, download_error, cached_text), text, error in extraction.map(downloads):
+                yield self._to_record(offer_id, c, download_error or error, cached_text, text, cache)
+
+        if cache is not None:
+            print("CVs - Cache texte:", cache.stats())
+
+    async def aiter_cvs(self, offer_id: str, limit: int = None):
+        """Async variant of `iter_cvs`: GridFS reads and PDF parsing overlap with other coroutines."""
+        from src.utils.async_data_access import aiter_candidates, fetch_gridfs_files_async
+
+        loop = asyncio.get_running_loop()
+        cache = get_cv_text_cache()
+        plan = self._plan(offer_id, limit)
+        await asyncio.to_thread(get_applicant_store().reset, offer_id)
+
+        async def download(group):
+            results, missing = await asyncio.to_thread(self._split_group, group, cache)
+            files = self._missing_files(missing)
             try:
-                file = fs.get(ObjectId(cv_id))
-                text = self._extract_text(file.read())
-                results.append({
-                    "candidate_id": str(c["_id"]),
-                    "filename": file.filename,
-                    "text": text
-                })
+                contents, errors = await fetch_gridfs_files_async(files.keys(), files=files)
             except Exception as e:
-                results.append({
-                    "candidate_id": str(c["_id"]),
-                    "filename": str(cv_id),
-                    "error": str(e)
-                })
+                contents, errors = {}, {file_id: str(e) for file_id in files}
+            return self._merge_downloads(results, missing, contents, errors)
+
+        async def extract(item):
+            (c, download_error, cached_text), pdf_bytes = item
+            text, error = None, None
+            if pdf_bytes is not None:
+                try:
+                    text = await loop.run_in_executor(executor, extract_pdf_text, pdf_bytes)
+                except Exception as e:
+                    error = str(e)
+            return self._to_record(offer_id, c, download_error or error, cached_text, text, cache)
+
+        executor = process_pool(self.extraction_workers) if self.extraction_workers > 1 else None
+        downloads, extractions = deque(), deque()
+        try:
+            group_iter = self._aiter_groups(aiter_candidates(plan, batch_size=self.batch_size))
+            async for group in group_iter:
+                downloads.append(asyncio.ensure_future(download(group)))
+                while len(downloads) >= self.max_in_flight:
+                    for item in await downloads.popleft():
+                        extractions.append(asyncio.ensure_future(extract(item)))
+                while extractions and (extractions[0].done() or len(extractions) > self.extraction_workers * 2):
+                    yield await extractions.popleft()
+            while downloads:
+                for item in await downloads.popleft():
+                    extractions.append(asyncio.ensure_future(extract(item)))
+            while extractions:
+                yield await extractions.popleft()
+        finally:
+            for task in (*downloads, *extractions):
+                task.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        if cache is not None:
+            print("CVs - Cache texte:", cache.stats())
+
+    def _plan(self, offer_id, limit):
+        # Le filtre traite=False suffit à ne lire que le delta : un filtre sur la date
+        # sauterait les CVs en échec ou hors limite antérieurs au dernier CV traité
+        return CVQueryPlan(offer_id, limit=limit)
+
+    def _to_record(self, offer_id, c, error, cached_text, text, cache=None):
+        applicants = get_applicant_store()
+        if error:
+            # Ne passe pas par l'extracteur : l'échec est enregistré ici pour le classement
+            applicants.save(offer_id, [{"candidate_id": str(c["candidate_id"]), "error": error}])
+            return {
+                "candidate_id": str(c["candidate_id"]),
+                "filename": str(c["cv_file_id"]),
+                "error": error
+            }
+        if cached_text is not None:
+            text = cached_text
+        elif cache is not None and text and text.strip():
+            # Un texte vide (PDF scanné sans OCR) n'est pas mis en cache : il sera ré-extrait
+            cache.set(cv_text_cache_key(c), text)
+        applicants.register(offer_id, str(c["candidate_id"]))
+        if self.incremental:
+            record_fetched(offer_id, str(c["candidate_id"]), c["postulation_ids"], c.get("applied_at"))
+        record = {
+            "candidate_id": str(c["candidate_id"]),
+            "filename": c["file"].get("filename"),
+            "text": text
+        }
+        if c.get("content_hash"):
+            record["content_hash"] = c["content_hash"]
+        return record
+
+    def _iter_downloads(self, io_pool, db, candidates, cache=None):
+        """
+        Yield ((candidate, error, cached_text), pdf_bytes) in order, reading up to
+        `max_in_flight` batches ahead. Cached CVs are not downloaded (pdf_bytes is None).
+        """
+        pending = deque()
+        try:
+            for group in self._iter_groups(candidates):
+                pending.append(io_pool.submit(self._download_group, db, group, cache))
+                if len(pending) >= self.max_in_flight:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            # Le consommateur peut s'arrêter avant la fin (ex: premier CV suffisant)
+            for future in pending:
+                future.cancel()
+
+    def _iter_groups(self, candidates):
+        """Split candidates into batches bounded by file count and total PDF size."""
+        state = [[], 0]
+        for c in candidates:
+            full = self._add_to_group(state, c)
+            if full:
+                yield full
+        if state[0]:
+            yield state[0]
+
+    async def _aiter_groups(self, candidates):
+        state = [[], 0]
+        async for c in candidates:
+            full = self._add_to_group(state, c)
+            if full:
+                yield full
+        if state[0]:
+            yield state[0]
+
+    def _add_to_group(self, state, c):
+        """Append c to the current [group, size] batch; return the previous batch if c did not fit."""
+        group, size = state
+        length = (c.get("file") or {}).get("length", 0)
+        full = None
+        if group and (len(group) >= self.gridfs_batch_files or size + length > self.gridfs_batch_bytes):
+            full, group, size = group, [], 0
+        group.append(c)
+        state[:] = [group, size + length]
+        return full
+
+    def _download_group(self, db, group, cache=None):
+        results, missing = self._split_group(group, cache)
+        files = self._missing_files(missing)
+        try:
+            contents, errors = fetch_gridfs_files(db, files.keys(), files=files)
+        except Exception as e:
+            contents, errors = {}, {file_id: str(e) for file_id in files}
+        return self._merge_downloads(results, missing, contents, errors)
+
+    def _split_group(self, group, cache=None):
+        """Resolve what can be answered without GridFS; returns (results, {index: candidate to download})."""
+        results = []
+        missing = {}
+        for c in group:
+            cv_id = c["cv_file_id"]
+            if not c.get("file"):
+                results.append(((c, f"no file with id {cv_id!r}", None), None))
+                continue
+            text = cache.get(cv_text_cache_key(c)) if cache is not None else None
+            if text is not None:
+                results.append(((c, None, text), None))
+                continue
+            missing[len(results)] = c
+            results.append(None)
+        return results, missing
+
+    def _missing_files(self, missing):
+        return {ObjectId(c["cv_file_id"]): c["file"] for c in missing.values()}
 
-        return results[:MAX_CVS]
+    def _merge_downloads(self, results, missing, contents, errors):
+        for i, c in missing.items():
+            file_id = ObjectId(c["cv_file_id"])
+            if file_id in contents:
+                c["content_hash"] = content_hash(contents[file_id])
+                results[i] = ((c, None, None), contents[file_id])
+            else:
+                results[i] = ((c, errors.get(file_id, "download failed"), None), None)
+        return results
 
     def _extract_text(self, pdf_bytes):
-        text = ""
-        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
-            for page in doc:
-                text += page.get_text()
-        return text
+        return extract_pdf_text(pdf_bytes)
@@ -1,21 +1,43 @@
-import requests
 from crewai.tools import BaseTool
+from src.config.settings import OFFER_NER_MODEL_VERSION
+from src.utils.ner_backends import get_ner_backend
+from src.utils.entity_cache import get_entity_cache
+from src.utils.skill_vocabulary import get_skill_vocabulary
+from src.utils.skill_index import get_skill_index
+from src.utils.offer_entity_store import offer_fingerprint, current_offer, get_offer_entities, save_offer_entities
 
 class JobOfferEntityExtractor(BaseTool):
     name: str = "Job Offer Entity Extractor"
     description: str = "Extract structured entities (skills, experience, education) from a job offer."
 
     def _run(self, input_data: dict):
-        description = input_data.get("description")
-        if not description:
-            raise ValueError("Missing 'description' in input_data.")
+        # Entités déjà extraites pour cette version de l'offre. L'empreinte et la description
+        # viennent de MongoDB : celles relayées par le LLM peuvent différer d'un espace
+        offer_id = input_data.get("id") or input_data.get("offer_id")
+        current = current_offer(offer_id) if offer_id else None
+        if current is not None and current[1]:
+            fingerprint, description = current
+        else:
+            description = input_data.get("description")
+            if not description:
+                raise ValueError("Missing 'description' in input_data.")
+            fingerprint = offer_fingerprint(input_data.get("updated_at"), description)
+        if offer_id:
+            stored = get_offer_entities(offer_id, fingerprint)
+            if stored is not None:
+                self._index(offer_id, stored)
+                print("Offres - Entités (cache):", stored)
+                return stored
 
-        try:
-            response = requests.post("http://127.0.0.1:5000/predict", json={"job_offer": description})
-            response.raise_for_status()
-            entities = response.json()
-        except Exception as e:
-            raise RuntimeError(f"Error contacting job offer entity API: {e}")
+        backend = get_ner_backend()
+        cache = get_entity_cache(backend.offer_name, OFFER_NER_MODEL_VERSION)
+        cached = cache.get(description) if cache is not None else None
+        entities = cached
+        if entities is None:
+            try:
+                entities = backend.extract_offer(description)
+            except Exception as e:
+                raise RuntimeError(f"Error contacting job offer entity API: {e}")
 
         # Validation
         required_fields = ["hard_skills", "soft_skills", "experience", "education"]
@@ -24,7 +46,22 @@ class JobOfferEntityExtractor(BaseTool):
         missing_keys = [field for field in required_fields if field not in entities]
         if missing_keys:
             raise ValueError(f"Job offer entity extraction failed: missing keys {missing_keys}")
+        if cache is not None and cached is None:
+            cache.set(description, entities)
 
+        vocabulary = get_skill_vocabulary()
+        entities = dict(entities)
+        for field in ("hard_skills", "soft_skills"):
+            entities[field] = vocabulary.canonical_names(entities[field] or [])
+        if offer_id:
+            save_offer_entities(offer_id, fingerprint, entities)
+            self._index(offer_id, entities)
 
         print("Offres - Entités extraites:", entities)
         return entities
+
+    def _index(self, offer_id, entities):
+        """Make the offer findable from candidate skills (no-op when unchanged)."""
+        index = get_skill_index()
+        if index is not None:
+            index.add_offer(offer_id, entities.get("hard_skills") or [])
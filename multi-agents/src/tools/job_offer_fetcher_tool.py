@@ -1,20 +1,29 @@
-from pymongo import MongoClient
 from crewai.tools import BaseTool
-from src.config.settings import MONGO_URI
+from src.utils.mongo_client import get_database
+
+OFFER_PROJECTION = {"title": 1, "description": 1, "updatedAt": 1}
 
 class JobOfferFetcher(BaseTool):
     name: str = "Job Offer Fetcher"
     description: str = "Fetches the latest job offer (title, description, and ID)."
 
     def _run(self):
-        client = MongoClient(MONGO_URI)
-        db = client['recrutement']
-        offer = db['offre'].find_one(sort=[("createdAt", -1)])
+        db = get_database()
+        offer = db['offre'].find_one(sort=[("createdAt", -1)], projection=OFFER_PROJECTION)
+        return self._format(offer)
+
+    async def _arun(self):
+        from src.utils.async_data_access import fetch_latest_offer
+
+        return self._format(await fetch_latest_offer(projection=OFFER_PROJECTION))
+
+    def _format(self, offer):
         if not offer:
             return {"error": "No offer found."}
 
         return {
             "id": str(offer["_id"]),
             "title": offer.get("title", ""),
-            "description": offer.get("description", "")
+            "description": offer.get("description", ""),
+            "updated_at": offer["updatedAt"].isoformat() if offer.get("updatedAt") else None
         }
@@ -1,13 +1,15 @@
-import requests
 from crewai.tools import BaseTool
 from typing import Dict, Any
 from src.config import settings
+from src.utils.http_client import post_json
+from src.utils.offer_entity_store import get_offer_entities
 
 class QuizGenerationTool(BaseTool):
     name: str = "Quiz Generator"
     description: str = (
         "Generates context for each hard skill using a Flask API. "
-        "Expects input_data to include either 'hard_skills' directly, or under job_offer.entities."
+        "Expects input_data to include either 'hard_skills' directly, under job_offer.entities, "
+        "or an 'offer_id' whose entities were already extracted."
     )
 
     def _run(self, input_data: Dict[str, Any]):
@@ -24,6 +26,12 @@ class QuizGenerationTool(BaseTool):
             except (KeyError, TypeError):
                 pass
 
+        # Cas 3 : input_data["offer_id"] -> entités déjà extraites par job_offer_task
+        if hard_skills is None and isinstance(input_data, dict) and input_data.get("offer_id"):
+            entities = get_offer_entities(input_data["offer_id"])
+            if entities is not None:
+                hard_skills = entities.get("hard_skills")
+
         if not isinstance(hard_skills, list) or not all(isinstance(s, str) for s in hard_skills):
             return {"error": "Missing or invalid 'hard_skills' field. Must be a list of strings."}
 
@@ -33,8 +41,6 @@ class QuizGenerationTool(BaseTool):
         url = settings.CONTEXT_API_URL  # ex: http://localhost:5001/get_contexts
 
         try:
-            response = requests.post(url, json={"hard_skills": limited_hard_skills})
-            response.raise_for_status()
-            return response.json()
+            return post_json(url, {"hard_skills": limited_hard_skills})
         except Exception as e:
             return {"error": str(e)}
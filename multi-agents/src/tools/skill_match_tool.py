@@ -0,0 +1,45 @@
+from typing import List, Optional, Set
+from bson import ObjectId
+from crewai.tools import BaseTool
+from src.config.settings import SKILL_INDEX_TOP_K
+from src.utils.mongo_client import get_database
+from src.utils.skill_index import get_skill_index
+
+
+class SkillMatchFinder(BaseTool):
+    name: str = "Skill Match Finder"
+    description: str = (
+        "Search the whole candidate base and all indexed job offers by hard skills. "
+        "Give an `offer_id` to find the best-fitting candidates who did not apply to it (the applicants "
+        "are looked up by the tool; set `include_applicants` to keep them), a `candidate_id` to find the "
+        "best-fitting offers, or a list of `offer_ids` to get the best candidates of each offer at once."
+    )
+
+    def _run(self, offer_id: Optional[str] = None, candidate_id: Optional[str] = None,
+             offer_ids: Optional[List[str]] = None, include_applicants: bool = False,
+             top_k: int = SKILL_INDEX_TOP_K):
+        index = get_skill_index()
+        if index is None:
+            raise RuntimeError("The skill index is disabled (SKILL_INDEX_ENABLED=false).")
+
+        if offer_ids:
+            matches = index.match_offers_to_candidates(offer_ids, top_k)
+            print(f"Index compétences - candidats trouvés pour {len(matches)}/{len(offer_ids)} offres")
+            return {"offers": [{"offer_id": o, "candidates": matches.get(str(o), [])} for o in offer_ids]}
+        if offer_id:
+            # Les candidats ayant postulé sont lus dans MongoDB, pas recopiés par le LLM
+            exclude = () if include_applicants else self._applicants(offer_id)
+            matches = index.candidates_for_offer(offer_id, top_k, exclude=exclude)
+            print(f"Index compétences - {len(matches)} candidats pour l'offre {offer_id}")
+            return {"offer_id": offer_id, "candidates": matches}
+        if candidate_id:
+            matches = index.offers_for_candidate(candidate_id, top_k)
+            print(f"Index compétences - {len(matches)} offres pour le candidat {candidate_id}")
+            return {"candidate_id": candidate_id, "offers": matches}
+        raise ValueError("Provide 'offer_id', 'candidate_id' or 'offer_ids'.")
+
+    def _applicants(self, offer_id: str) -> Set[str]:
+        if not ObjectId.is_valid(str(offer_id)):
+            return set()
+        ids = get_database()['postulation'].distinct("id_candidat", {"id_offre": ObjectId(str(offer_id))})
+        return {str(i) for i in ids}
@@ -0,0 +1,86 @@
+"""
+Extracted applicants persisted per offer, so the ranking step reads them itself instead of
+having the LLM copy every CV's entities from one task to the next.
+
+CVFetcher resets the offer and registers which offer each fetched candidate belongs to;
+CVEntityExtractor then stores its results ({"candidate_id", "entities"} or
+{"candidate_id", "error"}) under that offer, and CandidateScorer loads them by offer id.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+from src.config.settings import APPLICANT_STORE_PATH
+
+
+class ApplicantStore:
+
+    def __init__(self, path: str = APPLICANT_STORE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS offer_applicants ("
+            "offer_id TEXT NOT NULL, candidate_id TEXT NOT NULL, applicant TEXT NOT NULL, "
+            "PRIMARY KEY (offer_id, candidate_id))"
+        )
+        # Candidat -> offre pour laquelle il a été lu pendant ce processus
+        self._offers: Dict[str, str] = {}
+
+    def reset(self, offer_id: str):
+        """Forget the applicants stored for this offer by a previous run."""
+        with self._lock:
+            self._conn.execute("DELETE FROM offer_applicants WHERE offer_id = ?", (str(offer_id),))
+            self._offers = {cid: oid for cid, oid in self._offers.items() if oid != str(offer_id)}
+
+    def register(self, offer_id: str, candidate_id: str):
+        with self._lock:
+            self._offers[str(candidate_id)] = str(offer_id)
+
+    def offer_of(self, candidate_id: str) -> Optional[str]:
+        with self._lock:
+            return self._offers.get(str(candidate_id))
+
+    def save(self, offer_id: str, applicants: Iterable[Dict[str, Any]]) -> int:
+        rows = [
+            (str(offer_id), str(a["candidate_id"]), json.dumps(a, ensure_ascii=False))
+            for a in applicants if a.get("candidate_id") is not None
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO offer_applicants (offer_id, candidate_id, applicant) VALUES (?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def save_extracted(self, applicants: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Store extractor results under the offer each candidate was fetched for; returns counts per offer."""
+        by_offer: Dict[str, List[Dict[str, Any]]] = {}
+        for applicant in applicants:
+            offer_id = self.offer_of(applicant.get("candidate_id"))
+            if offer_id is not None:
+                by_offer.setdefault(offer_id, []).append(applicant)
+        return {offer_id: self.save(offer_id, group) for offer_id, group in by_offer.items()}
+
+    def load(self, offer_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT applicant FROM offer_applicants WHERE offer_id = ?", (str(offer_id),)
+            ).fetchall()
+        return [json.loads(applicant) for applicant, in rows]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_applicant_store() -> ApplicantStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ApplicantStore()
+        return _store
@@ -0,0 +1,83 @@
+"""
+Asyncio data access layer (motor) used by the fetch tools' `_arun`.
+
+Mirrors the synchronous helpers (mongo_client, cv_query_planner, gridfs_bulk) so offers,
+postulations and CV blobs can be read while other coroutines parse PDFs or call the NER APIs.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict, Iterable, Optional, Tuple
+from bson import ObjectId
+from src.config.settings import (
+    MONGO_URI, MONGO_DB_NAME, MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE,
+    MONGO_CONNECT_TIMEOUT_MS, MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_SOCKET_TIMEOUT_MS, MONGO_WAIT_QUEUE_TIMEOUT_MS
+)
+from src.utils.cv_query_planner import CVQueryPlan
+from src.utils.gridfs_bulk import (
+    CHUNK_PROJECTION, CHUNK_SORT, FILE_PROJECTION, assemble_gridfs_files, split_known_files
+)
+from src.utils.mongo_client import pool_metrics
+
+# Un client motor est lié à une boucle : l'entrée disparaît avec la boucle
+_clients = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def get_async_database(name: str = MONGO_DB_NAME):
+    """Return a motor database bound to the running event loop (one client per loop)."""
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _clients.get(loop)
+        if client is None:
+            client = AsyncIOMotorClient(
+                MONGO_URI,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+                serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+                waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                event_listeners=[pool_metrics]
+            )
+            _clients[loop] = client
+    return client[name]
+
+
+def close_async_clients():
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+async def fetch_latest_offer(projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    db = get_async_database()
+    return await db['offre'].find_one(sort=[("createdAt", -1)], projection=projection)
+
+
+async def aiter_candidates(plan: CVQueryPlan, batch_size: int = 100):
+    db = get_async_database()
+    async for c in db['postulation'].aggregate(plan.pipeline(), batchSize=batch_size):
+        yield c
+
+
+async def fetch_gridfs_files_async(file_ids: Iterable[Any], files: Optional[Dict[ObjectId, Dict[str, Any]]] = None,
+                                   bucket: str = "fs") -> Tuple[Dict[ObjectId, bytes], Dict[ObjectId, str]]:
+    """Async counterpart of gridfs_bulk.fetch_gridfs_files."""
+    ids = [ObjectId(file_id) for file_id in file_ids]
+    if not ids:
+        return {}, {}
+
+    db = get_async_database()
+    if files is None:
+        files = {f["_id"]: f async for f in db[f"{bucket}.files"].find({"_id": {"$in": ids}}, FILE_PROJECTION)}
+    wanted, errors = split_known_files(ids, files)
+
+    cursor = db[f"{bucket}.chunks"].find({"files_id": {"$in": wanted}}, CHUNK_PROJECTION).sort(CHUNK_SORT)
+    chunks = [chunk async for chunk in cursor]
+    return assemble_gridfs_files(wanted, files, chunks, errors)
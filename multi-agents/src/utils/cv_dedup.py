@@ -0,0 +1,55 @@
+"""
+Duplicate CV detection before entity extraction.
+
+Two CVs are the same work if their PDF bytes hash equal (`content_hash`, set by CVFetcher)
+or if their normalized extracted text hashes equal.
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, List, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def dedup_cvs(cv_data: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[List[int]]]:
+    """
+    Collapse duplicate CVs.
+
+    Returns (unique, groups): `unique[i]` is the first entry of a duplicate group and
+    `groups[i]` lists the indexes in `cv_data` it stands for.
+    """
+    unique, groups = [], []
+    group_of = {}
+    for index, entry in enumerate(cv_data):
+        keys = [("text", text_hash(entry["text"]))]
+        if entry.get("content_hash"):
+            keys.append(("pdf", entry["content_hash"]))
+
+        group = next((group_of[k] for k in keys if k in group_of), None)
+        if group is None:
+            group = len(unique)
+            unique.append(entry)
+            groups.append([])
+        groups[group].append(index)
+        for k in keys:
+            group_of.setdefault(k, group)
+    return unique, groups
+
+
+def expand_results(groups: List[List[int]], unique_results: List[Any]) -> List[Tuple[int, Any]]:
+    """Map each unique result back to every original index, in original order."""
+    expanded = [(index, result) for indexes, result in zip(groups, unique_results) for index in indexes]
+    return sorted(expanded, key=lambda pair: pair[0])
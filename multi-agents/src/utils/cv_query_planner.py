@@ -0,0 +1,73 @@
+"""
+Query planning for CV retrieval: limit, sort and projection are applied inside MongoDB.
+
+The pipeline only uses stages and operators available since MongoDB 4.0 ($convert).
+"""
+
+from typing import Any, Dict, List, Optional
+from bson import ObjectId
+from src.config.settings import CV_SORT_FIELD, CV_SORT_ORDER
+
+
+class CVQueryPlan:
+    """Aggregation over postulation -> candidat -> fs.files returning only what CVFetcher needs."""
+
+    def __init__(self, offer_id: str, limit: Optional[int] = None,
+                 sort_field: str = CV_SORT_FIELD, sort_order: int = CV_SORT_ORDER):
+        self.offer_id = ObjectId(offer_id)
+        self.limit = limit
+        self.sort_field = sort_field
+        self.sort_order = sort_order
+
+    def pipeline(self) -> List[Dict[str, Any]]:
+        # Ne récupérer que les postulations non traitées
+        stages = [
+            {"$match": {"id_offre": self.offer_id, "traite": False}},
+            # Un candidat peut avoir postulé plusieurs fois à la même offre
+            {"$group": {
+                "_id": "$id_candidat",
+                "postulation_ids": {"$push": "$_id"},
+                "applied_at": {"$min": f"${self.sort_field}"}
+            }},
+            {"$sort": {"applied_at": self.sort_order, "_id": 1}},
+            # Forme let/$expr : localField + pipeline n'est accepté qu'à partir de MongoDB 5.0
+            {"$lookup": {
+                "from": "candidat",
+                "let": {"candidate_id": "$_id"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$_id", "$$candidate_id"]}}},
+                    {"$project": {"_id": 0, "cv_file_id": 1}}
+                ],
+                "as": "candidat"
+            }},
+            {"$unwind": "$candidat"},
+            {"$match": {"candidat.cv_file_id": {"$nin": [None, ""]}}},
+        ]
+        # La limite est appliquée avant toute lecture GridFS
+        if self.limit is not None:
+            stages.append({"$limit": self.limit})
+        stages += [
+            {"$lookup": {
+                "from": "fs.files",
+                "let": {"cv_id": {"$convert": {
+                    "input": "$candidat.cv_file_id", "to": "objectId", "onError": None
+                }}},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$_id", "$$cv_id"]}}},
+                    {"$project": {"_id": 0, "filename": 1, "length": 1, "chunkSize": 1, "md5": 1}}
+                ],
+                "as": "file"
+            }},
+            {"$project": {
+                "_id": 0,
+                "candidate_id": "$_id",
+                "postulation_ids": 1,
+                "applied_at": 1,
+                "cv_file_id": "$candidat.cv_file_id",
+                "file": {"$arrayElemAt": ["$file", 0]}
+            }},
+        ]
+        return stages
+
+    def execute(self, db, batch_size: int = 100):
+        return db['postulation'].aggregate(self.pipeline(), batchSize=batch_size)
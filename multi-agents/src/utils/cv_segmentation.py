@@ -0,0 +1,80 @@
+"""
+Token-budgeted segmentation of CV text for entity extraction, and merging of the
+per-chunk entities back into one record per CV.
+"""
+
+import re
+from typing import Any, Dict, List
+from src.config.settings import CV_NER_MAX_TOKENS, CV_NER_TOKENS_PER_WORD
+
+_BLOCK_SEPARATOR = re.compile(r"\n\s*\n")
+
+
+def estimate_tokens(text: str, tokens_per_word: float = CV_NER_TOKENS_PER_WORD) -> int:
+    """Rough sub-word token count, good enough to stay under the model's sequence limit."""
+    return int(len(text.split()) * tokens_per_word)
+
+
+def segment_text(text: str, max_tokens: int = CV_NER_MAX_TOKENS,
+                 tokens_per_word: float = CV_NER_TOKENS_PER_WORD) -> List[str]:
+    """
+    Split a CV into chunks of at most `max_tokens` estimated tokens.
+
+    Blocks (sections separated by blank lines) are packed together while they fit; a block
+    that is too long on its own is split by lines, and a line that is too long by words.
+    """
+    if max_tokens <= 0 or estimate_tokens(text, tokens_per_word) <= max_tokens:
+        return [text]
+
+    max_words = max(1, int(max_tokens / tokens_per_word))
+    pieces = []
+    for block in _BLOCK_SEPARATOR.split(text):
+        if len(block.split()) <= max_words:
+            pieces.append(block)
+            continue
+        for line in block.splitlines():
+            words = line.split()
+            if len(words) <= max_words:
+                pieces.append(line)
+            else:
+                pieces.extend(" ".join(words[i:i + max_words]) for i in range(0, len(words), max_words))
+
+    chunks, current, current_words = [], [], 0
+    for piece in pieces:
+        words = len(piece.split())
+        if not words:
+            continue
+        if current and current_words + words > max_words:
+            chunks.append("\n".join(current))
+            current, current_words = [], 0
+        current.append(piece)
+        current_words += words
+    if current:
+        chunks.append("\n".join(current))
+    return chunks or [text]
+
+
+def merge_entities(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge the entities extracted from the chunks of one CV.
+
+    List fields are concatenated without duplicates (first occurrence order); other
+    fields keep the first non-empty value, since names and emails come from the CV header.
+    """
+    merged: Dict[str, Any] = {}
+    seen: Dict[str, set] = {}
+    for part in parts:
+        for key, value in part.items():
+            if isinstance(value, list):
+                values = merged.setdefault(key, [])
+                keys = seen.setdefault(key, set())
+                for item in value:
+                    marker = item.strip().lower() if isinstance(item, str) else repr(item)
+                    if marker not in keys:
+                        keys.add(marker)
+                        values.append(item)
+            elif not merged.get(key) and value:
+                merged[key] = value
+            else:
+                merged.setdefault(key, value)
+    return merged
@@ -0,0 +1,32 @@
+"""
+Process-wide cache of text extracted from CV PDFs, keyed by GridFS file.
+"""
+
+import threading
+from typing import Any, Dict, Optional
+from src.config.settings import CV_TEXT_CACHE_ENABLED, CV_TEXT_CACHE_PATH, CV_TEXT_CACHE_MAX_BYTES
+from src.utils.disk_cache import DiskCache
+from src.utils.pdf_ocr import ocr_signature
+
+_cache = None
+_lock = threading.Lock()
+
+
+def get_cv_text_cache() -> Optional[DiskCache]:
+    """Return the shared cache, or None when CV_TEXT_CACHE_ENABLED is off."""
+    global _cache
+    if not CV_TEXT_CACHE_ENABLED:
+        return None
+    with _lock:
+        if _cache is None:
+            _cache = DiskCache(CV_TEXT_CACHE_PATH, CV_TEXT_CACHE_MAX_BYTES, table="cv_text")
+        return _cache
+
+
+def cv_text_cache_key(candidate: Dict[str, Any]) -> str:
+    """
+    GridFS files are immutable: file id plus md5 (or length) identifies the content.
+    The OCR capabilities are part of the key since they change the extracted text.
+    """
+    file = candidate.get("file") or {}
+    return f"{candidate['cv_file_id']}:{file.get('md5') or file.get('length', '')}:{ocr_signature()}"
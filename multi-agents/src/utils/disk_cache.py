@@ -0,0 +1,131 @@
+"""
+Small SQLite-backed key/value cache with size-based LRU eviction.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Union
+
+Value = Union[str, bytes]
+
+# Une éviction libère jusqu'à 90 % de max_bytes, en lisant les victimes par paquets
+EVICTION_LOW_WATER = 0.9
+EVICTION_CHUNK = 256
+
+
+class DiskCache:
+    """
+    Persistent cache shared by the threads of a process.
+
+    Entries are evicted least-recently-used first once the stored values exceed `max_bytes`,
+    down to 90% of it so that inserts at capacity do not evict one entry at a time. Entries
+    expire `ttl` seconds after being written when a ttl is given.
+    """
+
+    def __init__(self, path: str, max_bytes: int, table: str = "cache", ttl: Optional[float] = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.table = table
+        self.ttl = ttl or None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL, "
+            "created REAL NOT NULL DEFAULT 0)"
+        )
+        columns = [row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")]
+        if "created" not in columns:
+            self._conn.execute(f"ALTER TABLE {table} ADD COLUMN created REAL NOT NULL DEFAULT 0")
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table}(accessed)")
+        self._size = self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Value]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, size, created FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            now = time.time()
+            if row is not None and self.ttl and row[2] + self.ttl < now:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._size -= row[1]
+                self.expirations += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(f"UPDATE {self.table} SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: Value):
+        size = len(value.encode("utf-8")) if isinstance(value, str) else len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._conn.execute(f"SELECT size FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, size, accessed, created) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._size += size - (old[0] if old else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def delete(self, key: str):
+        with self._lock:
+            old = self._conn.execute(f"SELECT size FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if old:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._size -= old[0]
+
+    def purge_prefix(self, prefix: str, keep_prefix: Optional[str] = None) -> int:
+        """Delete every key starting with `prefix`, except those starting with `keep_prefix`."""
+        query = f"SELECT key, size FROM {self.table} WHERE substr(key, 1, ?) = ?"
+        with self._lock:
+            rows = self._conn.execute(query, (len(prefix), prefix)).fetchall()
+            victims = [(key, size) for key, size in rows if not (keep_prefix and key.startswith(keep_prefix))]
+            self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", [(key,) for key, _ in victims])
+            self._size -= sum(size for _, size in victims)
+            return len(victims)
+
+    def _evict(self):
+        # On descend sous un seuil bas pour ne pas évincer à chaque insertion une fois plein
+        target = int(self.max_bytes * EVICTION_LOW_WATER)
+        evicted = 0
+        while self._size > target:
+            rows = self._conn.execute(
+                f"SELECT key, size FROM {self.table} ORDER BY accessed LIMIT ?", (EVICTION_CHUNK,)
+            ).fetchall()
+            if not rows:
+                break
+            victims = []
+            for key, size in rows:
+                if self._size <= target:
+                    break
+                victims.append((key,))
+                self._size -= size
+            self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", victims)
+            evicted += len(victims)
+        self.evictions += evicted
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes
+        }
@@ -0,0 +1,56 @@
+"""
+Persistent cache of NER results keyed by extractor endpoint, model version and text hash.
+"""
+
+import json
+import threading
+from typing import Any, Dict, List, Optional
+from src.config.settings import ENTITY_CACHE_ENABLED, ENTITY_CACHE_PATH, ENTITY_CACHE_MAX_BYTES, ENTITY_CACHE_TTL
+from src.utils.cv_dedup import text_hash
+from src.utils.disk_cache import DiskCache
+
+_disk_cache = None
+_caches: Dict[tuple, "EntityCache"] = {}
+_lock = threading.Lock()
+
+
+class EntityCache:
+    """
+    Entities for one (endpoint, model_version). Opening the cache for a new model
+    version drops every entry cached for the same endpoint under another version.
+    """
+
+    def __init__(self, cache: DiskCache, endpoint: str, model_version: str):
+        self.cache = cache
+        self.prefix = f"{endpoint}|"
+        self.version_prefix = f"{endpoint}|{model_version}|"
+        purged = cache.purge_prefix(self.prefix, keep_prefix=self.version_prefix)
+        if purged:
+            print(f"Cache entités: {purged} entrées invalidées pour {endpoint} (modèle {model_version})")
+
+    def _key(self, text: str) -> str:
+        return self.version_prefix + text_hash(text)
+
+    def get(self, text: str) -> Optional[Any]:
+        value = self.cache.get(self._key(text))
+        return json.loads(value) if value is not None else None
+
+    def set(self, text: str, entities: Any):
+        self.cache.set(self._key(text), json.dumps(entities, ensure_ascii=False))
+
+    def get_many(self, texts: List[str]) -> List[Optional[Any]]:
+        return [self.get(text) for text in texts]
+
+
+def get_entity_cache(endpoint: str, model_version: str) -> Optional[EntityCache]:
+    """Return the shared cache for this extractor, or None when ENTITY_CACHE_ENABLED is off."""
+    global _disk_cache
+    if not ENTITY_CACHE_ENABLED:
+        return None
+    with _lock:
+        if _disk_cache is None:
+            _disk_cache = DiskCache(ENTITY_CACHE_PATH, ENTITY_CACHE_MAX_BYTES, table="entities", ttl=ENTITY_CACHE_TTL)
+        key = (endpoint, model_version)
+        if key not in _caches:
+            _caches[key] = EntityCache(_disk_cache, endpoint, model_version)
+        return _caches[key]
@@ -0,0 +1,59 @@
+"""
+Bulk GridFS reads: many files from one fs.files query and one fs.chunks cursor.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from bson import ObjectId
+
+CHUNK_PROJECTION = {"_id": 0, "files_id": 1, "n": 1, "data": 1}
+CHUNK_SORT = [("files_id", 1), ("n", 1)]
+FILE_PROJECTION = {"length": 1, "chunkSize": 1}
+
+
+def fetch_gridfs_files(db, file_ids: Iterable[Any], files: Optional[Dict[ObjectId, Dict[str, Any]]] = None,
+                       bucket: str = "fs") -> Tuple[Dict[ObjectId, bytes], Dict[ObjectId, str]]:
+    """
+    Read several GridFS files at once.
+
+    `files` may carry already known fs.files metadata (length, chunkSize) keyed by id, in
+    which case fs.files is not queried again. Returns (contents, errors), both keyed by id.
+    The caller bounds memory by choosing how many files it asks for.
+    """
+    ids = [ObjectId(file_id) for file_id in file_ids]
+    if not ids:
+        return {}, {}
+
+    if files is None:
+        files = {f["_id"]: f for f in db[f"{bucket}.files"].find({"_id": {"$in": ids}}, FILE_PROJECTION)}
+    wanted, errors = split_known_files(ids, files)
+
+    cursor = db[f"{bucket}.chunks"].find({"files_id": {"$in": wanted}}, CHUNK_PROJECTION).sort(CHUNK_SORT)
+    return assemble_gridfs_files(wanted, files, cursor, errors)
+
+
+def split_known_files(ids: List[ObjectId], files: Dict[ObjectId, Dict[str, Any]]):
+    errors = {file_id: f"no file with id {file_id!r}" for file_id in ids if file_id not in files}
+    wanted = [file_id for file_id in ids if file_id in files]
+    return wanted, errors
+
+
+def assemble_gridfs_files(wanted, files, chunks, errors) -> Tuple[Dict[ObjectId, bytes], Dict[ObjectId, str]]:
+    """Rebuild file contents from chunks sorted by (files_id, n); shared by the sync and async readers."""
+    parts = {file_id: [] for file_id in wanted}
+    for chunk in chunks:
+        file_parts = parts[chunk["files_id"]]
+        if chunk["n"] != len(file_parts):
+            errors[chunk["files_id"]] = f"missing chunk {len(file_parts)} in file {chunk['files_id']!r}"
+        file_parts.append(chunk["data"])
+
+    contents = {}
+    for file_id in wanted:
+        if file_id in errors:
+            continue
+        data = b"".join(parts.pop(file_id))
+        expected = files[file_id].get("length")
+        if expected is not None and len(data) != expected:
+            errors[file_id] = f"truncated file {file_id!r}: {len(data)} of {expected} bytes"
+            continue
+        contents[file_id] = data
+    return contents, errors
@@ -0,0 +1,150 @@
+"""
+Shared HTTP client for the internal services (NER APIs, quiz context API).
+
+One pooled keep-alive session per process, default connect/read timeouts and
+per-endpoint latency counters. With HTTP2_ENABLED and httpx[http2] installed,
+requests go through an httpx client instead. Calls run under the resilience
+policy (deadline, retries, hedging, circuit breaker).
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from src.config.settings import HTTP_POOL_MAXSIZE, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP2_ENABLED
+from src.utils.resilience import ResiliencePolicy, default_policy
+from src.utils.wire_format import WireFormat
+
+DEFAULT_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+
+class LatencyStats:
+    """Count, errors and latency (total / max) per endpoint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, endpoint: str, elapsed: float, ok: bool):
+        with self._lock:
+            s = self._stats.setdefault(endpoint, {"count": 0, "errors": 0, "total_s": 0.0, "max_s": 0.0})
+            s["count"] += 1
+            s["errors"] += 0 if ok else 1
+            s["total_s"] += elapsed
+            s["max_s"] = max(s["max_s"], elapsed)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                endpoint: {**s, "avg_s": s["total_s"] / s["count"] if s["count"] else 0.0}
+                for endpoint, s in self._stats.items()
+            }
+
+
+latency_stats = LatencyStats()
+
+_session = None
+_session_pid = None
+_lock = threading.Lock()
+
+
+def _endpoint(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+
+def get_session():
+    """Return the process-wide session (requests.Session, or httpx.Client for HTTP/2)."""
+    global _session, _session_pid
+    with _lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = _create_session()
+            _session_pid = os.getpid()
+        return _session
+
+
+def _create_session():
+    if HTTP2_ENABLED:
+        try:
+            import httpx
+
+            return httpx.Client(
+                http2=True,
+                timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+                limits=httpx.Limits(max_connections=HTTP_POOL_MAXSIZE, max_keepalive_connections=HTTP_POOL_MAXSIZE)
+            )
+        except ImportError:
+            print("HTTP/2 indisponible (httpx[http2] non installé), utilisation de requests.")
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_MAXSIZE, pool_maxsize=HTTP_POOL_MAXSIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def decodes_zstd(session) -> bool:
+    """Whether the session transparently decodes zstd responses (installing zstandard is not enough)."""
+    if isinstance(session, requests.Session):
+        from urllib3.util.request import ACCEPT_ENCODING
+
+        return "zstd" in ACCEPT_ENCODING
+    try:
+        from httpx._decoders import SUPPORTED_DECODERS
+    except ImportError:
+        return False
+    return "zstd" in SUPPORTED_DECODERS
+
+
+def post_json(url: str, payload: Any, timeout: Optional[Tuple[float, float]] = None,
+              deadline: Optional[float] = None, policy: Optional[ResiliencePolicy] = None,
+              wire: Optional[WireFormat] = None) -> Any:
+    """
+    POST `payload` as JSON and return the decoded JSON response; raises on HTTP errors.
+
+    `timeout` is (connect, read) per try, `deadline` bounds the whole call in seconds.
+    With `wire`, the body is encoded (msgpack and/or compressed) as that format says.
+    """
+    connect, read = timeout or DEFAULT_TIMEOUT
+    policy = policy or default_policy
+    return policy.call(
+        _endpoint(url),
+        lambda read_timeout: _post_once(url, payload, connect, read_timeout, wire),
+        timeout=read,
+        deadline=deadline
+    )
+
+
+def _post_once(url: str, payload: Any, connect: float, read: float, wire: Optional[WireFormat] = None) -> Any:
+    session = get_session()
+    is_httpx = not isinstance(session, requests.Session)
+    if is_httpx:
+        import httpx
+
+        request_timeout = httpx.Timeout(read, connect=connect)
+    else:
+        request_timeout = (connect, read)
+
+    start = time.perf_counter()
+    ok = False
+    try:
+        if wire is None:
+            response = session.post(url, json=payload, timeout=request_timeout)
+            response.raise_for_status()
+            data = response.json()
+        else:
+            while True:
+                body, headers = wire.encode(payload, decodes_zstd(session))
+                body_arg = {"content": body} if is_httpx else {"data": body}
+                response = session.post(url, headers=headers, timeout=request_timeout, **body_arg)
+                # Service qui ne comprend pas msgpack : on repasse en JSON
+                if response.status_code != 415 or not wire.downgrade():
+                    break
+            response.raise_for_status()
+            data = wire.decode(response.headers.get("Content-Type"), response.content)
+        ok = True
+        return data
+    finally:
+        latency_stats.record(_endpoint(url), time.perf_counter() - start, ok)
@@ -0,0 +1,138 @@
+"""
+Process-wide pooled MongoDB client shared by every tool.
+"""
+
+import atexit
+import os
+import threading
+from typing import Any, Dict
+from pymongo import MongoClient, monitoring
+from src.config.settings import (
+    MONGO_URI, MONGO_DB_NAME, MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE,
+    MONGO_CONNECT_TIMEOUT_MS, MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_SOCKET_TIMEOUT_MS, MONGO_WAIT_QUEUE_TIMEOUT_MS
+)
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Counts connection pool events so the pool can be sized under concurrent offers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.checkout_failures = 0
+            self.checked_out = 0
+            self.max_checked_out = 0
+            self.connections_created = 0
+            self.connections_closed = 0
+            self.pool_clears = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed += 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "checked_out": self.checked_out,
+                "max_checked_out": self.max_checked_out,
+                "connections_created": self.connections_created,
+                "connections_closed": self.connections_closed,
+                "pool_clears": self.pool_clears,
+                "max_pool_size": MONGO_MAX_POOL_SIZE
+            }
+
+
+pool_metrics = PoolMetrics()
+
+_client = None
+_client_pid = None
+_lock = threading.Lock()
+
+
+def get_mongo_client() -> MongoClient:
+    """Return the shared client, creating it on first use (and again in a forked child)."""
+    global _client, _client_pid
+    with _lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = MongoClient(
+                MONGO_URI,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+                serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+                waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                event_listeners=[pool_metrics]
+            )
+            _client_pid = os.getpid()
+        return _client
+
+
+def get_database(name: str = MONGO_DB_NAME):
+    return get_mongo_client()[name]
+
+
+def close_mongo_client():
+    global _client, _client_pid
+    with _lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
+
+
+def _forget_client_after_fork():
+    # Les sockets du parent ne doivent pas être réutilisées dans l'enfant
+    global _client, _client_pid, _lock
+    _client = None
+    _client_pid = None
+    _lock = threading.Lock()
+    pool_metrics.reset()
+
+
+os.register_at_fork(after_in_child=_forget_client_after_fork)
+atexit.register(close_mongo_client)
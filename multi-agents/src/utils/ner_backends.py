@@ -0,0 +1,107 @@
+"""
+Entity extraction backends, selected with NER_BACKEND.
+
+- "http" (default): the Flask extraction APIs (CV_NER_API_URL, OFFER_NER_API_URL).
+- "inprocess": the models are loaded once in this process from the factories named by
+  CV_NER_INPROCESS_MODEL / OFFER_NER_INPROCESS_MODEL ("package.module:function").
+  The CV model must expose `extract(texts) -> list of entity dicts` and the offer model
+  `predict(description) -> entity dict`, i.e. what the APIs return.
+"""
+
+import importlib
+import threading
+from typing import Any, Callable, Dict, List
+from src.config.settings import (
+    NER_BACKEND, CV_NER_API_URL, OFFER_NER_API_URL, CV_NER_BATCH_SIZE,
+    CV_NER_INPROCESS_MODEL, OFFER_NER_INPROCESS_MODEL
+)
+from src.utils.http_client import post_json
+from src.utils.ner_batch_client import BatchExtractionClient
+from src.utils.wire_format import get_wire_format
+
+_models: Dict[str, Any] = {}
+_models_lock = threading.Lock()
+
+
+class NERBackend:
+    """`cv_name` / `offer_name` identify the extractor (used as entity cache namespace)."""
+
+    cv_name: str
+    offer_name: str
+
+    def extract_cvs(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """One entity dict per text; failures are returned as {"error": ...}."""
+        raise NotImplementedError
+
+    def extract_offer(self, description: str) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class HTTPNERBackend(NERBackend):
+
+    def __init__(self, cv_url: str = CV_NER_API_URL, offer_url: str = OFFER_NER_API_URL):
+        self.cv_name = cv_url
+        self.offer_name = offer_url
+
+    def extract_cvs(self, texts):
+        return BatchExtractionClient(url=self.cv_name).extract(texts)
+
+    def extract_offer(self, description):
+        return post_json(self.offer_name, {"job_offer": description}, wire=get_wire_format(self.offer_name))
+
+
+def load_model(spec: str) -> Any:
+    """Build the model named by `spec` once per process and share it between tool instances."""
+    with _models_lock:
+        if spec not in _models:
+            module_name, _, factory_name = spec.partition(":")
+            if not module_name or not factory_name:
+                raise ValueError(f"Invalid model spec {spec!r}, expected 'module:factory'.")
+            factory: Callable[[], Any] = getattr(importlib.import_module(module_name), factory_name)
+            _models[spec] = factory()
+        return _models[spec]
+
+
+class InProcessNERBackend(NERBackend):
+
+    def __init__(self, cv_model: str = CV_NER_INPROCESS_MODEL, offer_model: str = OFFER_NER_INPROCESS_MODEL,
+                 batch_size: int = CV_NER_BATCH_SIZE):
+        self.cv_model = cv_model
+        self.offer_model = offer_model
+        self.batch_size = max(1, batch_size)
+        self.cv_name = f"inprocess:{cv_model}"
+        self.offer_name = f"inprocess:{offer_model}"
+
+    def extract_cvs(self, texts):
+        if not self.cv_model:
+            raise ValueError("CV_NER_INPROCESS_MODEL is not set.")
+        model = load_model(self.cv_model)
+        results = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            try:
+                extracted = model.extract(batch)
+                if len(extracted) != len(batch):
+                    raise ValueError(f"expected {len(batch)} results, got {len(extracted)}")
+                results.extend(extracted)
+            except Exception as e:
+                results.extend({"error": f"In-process CV entity extraction failed: {e}"} for _ in batch)
+        return results
+
+    def extract_offer(self, description):
+        if not self.offer_model:
+            raise ValueError("OFFER_NER_INPROCESS_MODEL is not set.")
+        return load_model(self.offer_model).predict(description)
+
+
+_BACKENDS = {
+    "http": HTTPNERBackend,
+    "inprocess": InProcessNERBackend,
+}
+
+
+def get_ner_backend(name: str = NER_BACKEND) -> NERBackend:
+    try:
+        return _BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown NER_BACKEND {name!r}, expected one of {sorted(_BACKENDS)}.")
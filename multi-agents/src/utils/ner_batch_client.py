@@ -0,0 +1,78 @@
+"""
+Micro-batching client for the CV entity extraction API.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from src.config.settings import (
+    HTTP_CONNECT_TIMEOUT, CV_NER_API_URL, CV_NER_BATCH_SIZE, CV_NER_BATCH_CHARS, CV_NER_MAX_IN_FLIGHT, CV_NER_TIMEOUT
+)
+from src.utils.http_client import post_json
+from src.utils.resilience import CircuitOpenError, DeadlineExceeded
+from src.utils.wire_format import WireFormat, get_wire_format
+
+
+class BatchExtractionClient:
+    """
+    Sends texts to `POST {"texts": [...]}` in batches bounded by count and total characters,
+    with at most `max_in_flight` batches outstanding.
+
+    Results come back in input order. A failing batch is split in two and retried until the
+    offending text is isolated, so one bad CV only costs its own result. Batches rejected
+    because the service is down (open circuit, deadline) fail as a whole, without splitting.
+    """
+
+    def __init__(self, url: str = CV_NER_API_URL, batch_size: int = CV_NER_BATCH_SIZE,
+                 batch_chars: int = CV_NER_BATCH_CHARS, max_in_flight: int = CV_NER_MAX_IN_FLIGHT,
+                 timeout: float = CV_NER_TIMEOUT, wire: Optional[WireFormat] = None):
+        self.url = url
+        self.batch_size = max(1, batch_size)
+        self.batch_chars = max(1, batch_chars)
+        self.max_in_flight = max(1, max_in_flight)
+        self.timeout = timeout
+        self.wire = wire or get_wire_format(url)
+
+    def extract(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Return one entity dict per text; failed texts get {"error": ...}."""
+        batches = self._batches(texts)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            for indexes, extracted in zip(batches, pool.map(lambda b: self._extract_batch(texts, b), batches)):
+                for index, entities in zip(indexes, extracted):
+                    results[index] = entities
+        return results
+
+    def _batches(self, texts: List[str]) -> List[List[int]]:
+        batches, batch, chars = [], [], 0
+        for index, text in enumerate(texts):
+            if batch and (len(batch) >= self.batch_size or chars + len(text) > self.batch_chars):
+                batches.append(batch)
+                batch, chars = [], 0
+            batch.append(index)
+            chars += len(text)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _extract_batch(self, texts: List[str], indexes: List[int]) -> List[Dict[str, Any]]:
+        try:
+            return self._post([texts[i] for i in indexes])
+        except (CircuitOpenError, DeadlineExceeded) as e:
+            # Service indisponible : découper le lot ne ferait que multiplier les échecs
+            return [{"error": f"Error contacting CV entity API: {e}"}] * len(indexes)
+        except Exception as e:
+            if len(indexes) == 1:
+                return [{"error": f"Error contacting CV entity API: {e}"}]
+            middle = len(indexes) // 2
+            return self._extract_batch(texts, indexes[:middle]) + self._extract_batch(texts, indexes[middle:])
+
+    def _post(self, texts: List[str]) -> List[Dict[str, Any]]:
+        response = post_json(
+            self.url, {"texts": texts},
+            timeout=(HTTP_CONNECT_TIMEOUT, self.timeout),
+            wire=self.wire
+        )
+        extracted_info = response.get("extracted_info", [])
+        if len(extracted_info) != len(texts):
+            raise ValueError(f"expected {len(texts)} results, got {len(extracted_info)}")
+        return extracted_info
@@ -0,0 +1,100 @@
+"""
+Local stand-in for the NER services, speaking the same wire formats as the real ones
+(JSON or msgpack bodies, gzip/zstd request compression, gzip/zstd responses).
+
+Entities are computed naively from the skill vocabulary, which is enough to exercise
+the clients end to end without the models:
+
+    python -m src.utils.ner_stub_server --port 5004
+"""
+
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib.util import find_spec
+from typing import Any, Dict, List
+from src.utils.skill_vocabulary import get_skill_vocabulary
+from src.utils.wire_format import JSON, MSGPACK, MSGPACK_TYPES, compress, decompress, dumps, loads
+
+# Encodages de réponse proposés, zstd seulement si zstandard est installé
+RESPONSE_ENCODINGS = ("zstd", "gzip") if find_spec("zstandard") else ("gzip",)
+
+
+def fake_cv_entities(text: str) -> Dict[str, List[str]]:
+    vocabulary = get_skill_vocabulary()
+    words = text.split()
+    skills = sorted(vocabulary.mentions(text))
+    return {
+        "FNAME": words[:1],
+        "LNAME": words[1:2],
+        "EMAIL": [w for w in words if "@" in w][:1],
+        "HSKILL": skills,
+        "SSKILL": [],
+        "EXPERIENCE": [],
+        "EDUCATION": [],
+    }
+
+
+def fake_offer_entities(description: str) -> Dict[str, Any]:
+    return {
+        "hard_skills": fake_cv_entities(description)["HSKILL"],
+        "soft_skills": [],
+        "experience": [],
+        "education": [],
+    }
+
+
+class StubNERHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        # Toujours consommer le corps : la connexion est réutilisée (keep-alive)
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        content_type = (self.headers.get("Content-Type") or JSON).split(";")[0].strip()
+        if content_type not in (JSON, *MSGPACK_TYPES):
+            return self._send(415, b"", JSON)
+        try:
+            payload = loads(decompress(body, self.headers.get("Content-Encoding")), content_type)
+        except Exception as e:
+            return self._send(400, dumps({"error": str(e)}, JSON), JSON)
+
+        if self.path.rstrip("/").endswith("extract-info"):
+            result = {"extracted_info": [fake_cv_entities(t) for t in payload.get("texts", [])]}
+        elif self.path.rstrip("/").endswith("predict"):
+            result = fake_offer_entities(payload.get("job_offer", ""))
+        else:
+            return self._send(404, dumps({"error": "not found"}, JSON), JSON)
+
+        response_type = MSGPACK if MSGPACK in (self.headers.get("Accept") or "") else JSON
+        self._send(200, dumps(result, response_type), response_type)
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        accepted = self.headers.get("Accept-Encoding") or ""
+        encoding = next((e for e in RESPONSE_ENCODINGS if e in accepted), None)
+        if encoding and len(body) > 512:
+            body = compress(body, encoding)
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Serve in a daemon thread; `server.server_address` gives the bound port. Stop with shutdown()."""
+    server = ThreadingHTTPServer((host, port), StubNERHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stand-in NER service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5004)
+    args = parser.parse_args()
+    print(f"Stub NER sur http://{args.host}:{args.port} (/extract-info/, /predict)")
+    ThreadingHTTPServer((args.host, args.port), StubNERHandler).serve_forever()
@@ -0,0 +1,78 @@
+"""
+Extracted job offer entities persisted per offer, shared across runs and tasks.
+
+An entry is keyed by offer id and tagged with a fingerprint of the offer document
+(updatedAt + description hash + NER model version); any change to the offer makes
+the stored entities stale.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional, Tuple
+from bson import ObjectId
+from src.config.settings import ENTITY_CACHE_ENABLED, ENTITY_CACHE_PATH, ENTITY_CACHE_MAX_BYTES, OFFER_NER_MODEL_VERSION
+from src.utils.disk_cache import DiskCache
+from src.utils.mongo_client import get_database
+
+_store = None
+_lock = threading.Lock()
+
+
+def _get_store() -> Optional[DiskCache]:
+    global _store
+    if not ENTITY_CACHE_ENABLED:
+        return None
+    with _lock:
+        if _store is None:
+            _store = DiskCache(ENTITY_CACHE_PATH, ENTITY_CACHE_MAX_BYTES, table="offer_entities")
+        return _store
+
+
+def offer_fingerprint(updated_at: Any, description: str) -> str:
+    description_hash = hashlib.sha256((description or "").encode("utf-8")).hexdigest()
+    updated = updated_at.isoformat() if hasattr(updated_at, "isoformat") else str(updated_at or "")
+    return f"{OFFER_NER_MODEL_VERSION}|{updated}|{description_hash}"
+
+
+def current_offer(offer_id: str) -> Optional[Tuple[str, str]]:
+    """(fingerprint, description) of the offer as it is now in MongoDB, or None if it does not exist."""
+    if not ObjectId.is_valid(str(offer_id)):
+        return None
+    offer = get_database()['offre'].find_one({"_id": ObjectId(str(offer_id))}, {"updatedAt": 1, "description": 1})
+    if not offer:
+        return None
+    description = offer.get("description", "")
+    return offer_fingerprint(offer.get("updatedAt"), description), description
+
+
+def current_offer_fingerprint(offer_id: str) -> Optional[str]:
+    """Fingerprint of the offer as it is now in MongoDB, or None if it no longer exists."""
+    current = current_offer(offer_id)
+    return current[0] if current else None
+
+
+def get_offer_entities(offer_id: str, fingerprint: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Stored entities for an offer if they match `fingerprint`. Without a fingerprint the
+    offer is re-read from MongoDB (two small fields) to check the entry is still valid.
+    """
+    store = _get_store()
+    if store is None:
+        return None
+    value = store.get(str(offer_id))
+    if value is None:
+        return None
+    entry = json.loads(value)
+    if fingerprint is None:
+        fingerprint = current_offer_fingerprint(offer_id)
+    # Entrée périmée : elle sera remplacée à la prochaine extraction, pas supprimée ici
+    if entry["fingerprint"] != fingerprint:
+        return None
+    return entry["entities"]
+
+
+def save_offer_entities(offer_id: str, fingerprint: str, entities: Dict[str, Any]):
+    store = _get_store()
+    if store is not None:
+        store.set(str(offer_id), json.dumps({"fingerprint": fingerprint, "entities": entities}, ensure_ascii=False))
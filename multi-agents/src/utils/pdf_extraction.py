@@ -0,0 +1,140 @@
+"""
+PDF text extraction, serial or spread over a process pool.
+"""
+
+import multiprocessing
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+import fitz
+from src.config.settings import (
+    PDF_EXTRACTION_WORKERS, PDF_EXTRACTION_CHUNK_SIZE, PDF_EXTRACTION_ORDERED,
+    PDF_OCR_ENABLED, PDF_OCR_MAX_PAGES, PDF_OCR_MIN_CHARS
+)
+from src.utils.pdf_ocr import ocr_pages
+
+
+def extract_pdf_text(pdf_bytes: bytes, ocr: bool = PDF_OCR_ENABLED) -> str:
+    """
+    Extract the text layer of every page of a PDF.
+
+    Pages with (almost) no text are OCR'd, up to PDF_OCR_MAX_PAGES per document;
+    text PDFs never reach the OCR code.
+    """
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        pages = [page.get_text() for page in doc]
+        if ocr:
+            blank = [n for n, text in enumerate(pages) if len(text.strip()) < PDF_OCR_MIN_CHARS]
+            for n, text in ocr_pages(doc, blank[:PDF_OCR_MAX_PAGES]).items():
+                pages[n] = text
+    return "".join(pages)
+
+
+def _extract_chunk(payloads: List[Optional[bytes]]) -> List[Tuple[Optional[str], Optional[str]]]:
+    """Worker entry point: returns (text, error) for each payload of the chunk."""
+    results = []
+    for pdf_bytes in payloads:
+        if pdf_bytes is None:
+            results.append((None, None))
+            continue
+        try:
+            results.append((extract_pdf_text(pdf_bytes), None))
+        except Exception as e:
+            results.append((None, str(e)))
+    return results
+
+
+def _noop():
+    return None
+
+
+def process_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Worker processes started right away with forkserver (spawn where unavailable): forking
+    a process that already runs GridFS download and pymongo monitor threads can deadlock.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+    for future in [executor.submit(_noop) for _ in range(workers)]:
+        future.result()
+    return executor
+
+
+class PDFExtractionPool:
+    """
+    Extracts text from (key, pdf_bytes) pairs in worker processes.
+
+    Items are submitted in chunks of `chunk_size`, with at most two chunks per worker
+    outstanding so the input iterable is consumed lazily. Keys never leave this process.
+    A payload of None is passed through as (key, None, None), which lets callers keep
+    failed downloads in the stream.
+    """
+
+    def __init__(self, workers: int = PDF_EXTRACTION_WORKERS,
+                 chunk_size: int = PDF_EXTRACTION_CHUNK_SIZE,
+                 ordered: bool = PDF_EXTRACTION_ORDERED):
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.ordered = ordered
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def start(self):
+        """Start the worker processes now, e.g. before the caller starts its I/O threads."""
+        if self.workers > 1 and self._executor is None:
+            self._executor = process_pool(self.workers)
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def map(self, items: Iterable[Tuple[Any, Optional[bytes]]]) -> Iterator[Tuple[Any, Optional[str], Optional[str]]]:
+        """Yield (key, text, error) for every item, in input order if `ordered`."""
+        if self.workers == 1:
+            for key, pdf_bytes in items:
+                (text, error), = _extract_chunk([pdf_bytes])
+                yield key, text, error
+            return
+
+        self.start()
+
+        items = iter(items)
+        max_outstanding = self.workers * 2
+        outstanding = deque()
+
+        def submit_next() -> bool:
+            chunk = list(islice(items, self.chunk_size))
+            if not chunk:
+                return False
+            keys = [key for key, _ in chunk]
+            future = self._executor.submit(_extract_chunk, [payload for _, payload in chunk])
+            outstanding.append((keys, future))
+            return True
+
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(outstanding) < max_outstanding:
+                    exhausted = not submit_next()
+                if not outstanding:
+                    return
+
+                if self.ordered:
+                    keys, future = outstanding.popleft()
+                else:
+                    wait([f for _, f in outstanding], return_when=FIRST_COMPLETED)
+                    keys, future = next((k, f) for k, f in outstanding if f.done())
+                    outstanding.remove((keys, future))
+
+                for key, (text, error) in zip(keys, future.result()):
+                    yield key, text, error
+        finally:
+            for _, future in outstanding:
+                future.cancel()
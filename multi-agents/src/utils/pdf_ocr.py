@@ -0,0 +1,55 @@
+"""
+OCR fallback for PDF pages without a text layer (local Tesseract via pytesseract).
+"""
+
+import io
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Dict, List
+from src.config.settings import (
+    PDF_OCR_ENABLED, PDF_OCR_MAX_PAGES, PDF_OCR_DPI, PDF_OCR_LANG, PDF_OCR_WORKERS
+)
+
+_warned = False
+
+
+@lru_cache(maxsize=None)
+def ocr_signature() -> str:
+    """
+    What the OCR fallback can do in this environment. Part of the CV text cache key, so text
+    extracted without OCR (or with a smaller page budget) is redone once OCR is available.
+    """
+    if not PDF_OCR_ENABLED or find_spec("pytesseract") is None or find_spec("PIL") is None:
+        return "ocr-off"
+    return f"ocr-{PDF_OCR_MAX_PAGES}-{PDF_OCR_DPI}-{PDF_OCR_LANG}"
+
+
+def ocr_pages(doc, page_numbers: List[int]) -> Dict[int, str]:
+    """
+    Rasterize the given pages and OCR them in a small thread pool.
+
+    Rendering stays on the calling thread (PyMuPDF documents are not thread-safe);
+    Tesseract runs as a subprocess, so the threads overlap. Returns {} when
+    pytesseract/Pillow are not installed.
+    """
+    global _warned
+    if not page_numbers:
+        return {}
+    try:
+        import pytesseract
+        from PIL import Image
+    except ImportError:
+        if not _warned:
+            print("OCR désactivé: pytesseract/Pillow non installés.")
+            _warned = True
+        return {}
+
+    images = {n: doc[n].get_pixmap(dpi=PDF_OCR_DPI).tobytes("png") for n in page_numbers}
+
+    def ocr(png):
+        return pytesseract.image_to_string(Image.open(io.BytesIO(png)), lang=PDF_OCR_LANG)
+
+    with ThreadPoolExecutor(max_workers=max(1, PDF_OCR_WORKERS)) as pool:
+        texts = pool.map(ocr, images.values())
+        return dict(zip(images.keys(), texts))
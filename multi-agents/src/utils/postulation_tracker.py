@@ -0,0 +1,91 @@
+"""
+Incremental CV processing: deferred "traite" updates and a per-offer watermark.
+
+CVFetcher records the postulations it returned; CandidateScorer moves those of the
+candidates it actually scored to the pending set, and they are only flagged as processed,
+with a single bulk_write, once the whole run has succeeded (see run.py). Candidates whose
+CV failed stay traite=False and are retried next run. The delta of a run is selected by
+traite=False alone; the watermark only reports progress.
+"""
+
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from bson import ObjectId
+from pymongo import UpdateOne
+from src.config.settings import CV_SORT_ORDER
+from src.utils.mongo_client import get_database
+
+WATERMARK_COLLECTION = "postulation_watermark"
+
+_fetched: Dict[Tuple[str, str], Tuple[List[ObjectId], Any]] = {}
+_pending: Dict[ObjectId, Dict[str, Any]] = {}
+_lock = threading.Lock()
+
+
+def get_watermark(offer_id: str) -> Optional[Any]:
+    """Latest application date processed for this offer, if any (informational)."""
+    doc = get_database()[WATERMARK_COLLECTION].find_one({"_id": ObjectId(offer_id)}, {"applied_at": 1})
+    return doc.get("applied_at") if doc else None
+
+
+def record_processed(offer_id: str, postulation_ids: Iterable[ObjectId], applied_at: Any = None):
+    with _lock:
+        entry = _pending.setdefault(ObjectId(offer_id), {"ids": set(), "applied_at": None})
+        entry["ids"].update(postulation_ids)
+        if applied_at is not None and (entry["applied_at"] is None or applied_at > entry["applied_at"]):
+            entry["applied_at"] = applied_at
+
+
+def record_fetched(offer_id: str, candidate_id: str, postulation_ids: Iterable[ObjectId], applied_at: Any = None):
+    """Remember the postulations behind a fetched CV; nothing is flagged until the candidate is scored."""
+    with _lock:
+        _fetched[(str(offer_id), str(candidate_id))] = (list(postulation_ids), applied_at)
+
+
+def record_scored(offer_id: str, candidate_ids: Iterable[str]) -> int:
+    """Queue the postulations of the scored candidates for commit_processed()."""
+    with _lock:
+        scored = [_fetched.pop((str(offer_id), str(cid)), None) for cid in candidate_ids]
+    scored = [s for s in scored if s is not None]
+    for postulation_ids, applied_at in scored:
+        record_processed(offer_id, postulation_ids, applied_at)
+    return len(scored)
+
+
+def discard_pending():
+    with _lock:
+        _fetched.clear()
+        _pending.clear()
+
+
+def commit_processed() -> Dict[str, int]:
+    """Flag every recorded postulation as processed and advance the watermarks."""
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+    if not pending:
+        return {}
+
+    db = get_database()
+    now = datetime.now(timezone.utc)
+    ids = [pid for entry in pending.values() for pid in entry["ids"]]
+    result = db['postulation'].bulk_write(
+        [UpdateOne({"_id": pid}, {"$set": {"traite": True, "traiteAt": now}}) for pid in ids],
+        ordered=False
+    )
+
+    # Le filigrane n'est fiable que si les postulations sont lues de la plus ancienne à la plus récente
+    if CV_SORT_ORDER == 1:
+        watermarks = [
+            UpdateOne(
+                {"_id": offer_id},
+                {"$max": {"applied_at": entry["applied_at"]}, "$set": {"updatedAt": now}},
+                upsert=True
+            )
+            for offer_id, entry in pending.items() if entry["applied_at"] is not None
+        ]
+        if watermarks:
+            db[WATERMARK_COLLECTION].bulk_write(watermarks, ordered=False)
+
+    return {"offers": len(pending), "postulations": result.modified_count}
@@ -0,0 +1,202 @@
+"""
+Persistent per-offer ranking index.
+
+Each scored candidate is stored with its score, its feature row, its entities (so it can be
+rescored without re-extracting the CV) and, once the shortlist review ran, the LLM score and
+summary. Rows are indexed on (offer_id, score), so the ranking is read back already sorted.
+
+A run only scores candidates that are new, or whose entities changed. The whole offer is
+rescored from the stored entities only when its fingerprint changes: the offer entities or
+the scoring configuration (weights, skill matching).
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from src.config.settings import RANKING_INDEX_ENABLED, RANKING_INDEX_PATH
+from src.utils.records import CandidateRecord, OfferRecord
+from src.utils.scoring_engine import ScoringEngine, failed_entry, tier_for
+
+
+def _hash(data: Any) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class RankingIndex:
+
+    def __init__(self, path: str = RANKING_INDEX_PATH, engine: Optional[ScoringEngine] = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.engine = engine or ScoringEngine()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ranking_offers ("
+            "offer_id TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ranking_entries ("
+            "offer_id TEXT NOT NULL, candidate_id TEXT NOT NULL, score REAL NOT NULL, "
+            "entities_hash TEXT NOT NULL, entities TEXT NOT NULL, entry TEXT NOT NULL, features TEXT NOT NULL, "
+            "review TEXT, PRIMARY KEY (offer_id, candidate_id))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ranking_entries_score ON ranking_entries(offer_id, score DESC)"
+        )
+
+    def fingerprint(self, offer: OfferRecord) -> str:
+        matcher = self.engine.matcher
+        return _hash({
+            "entities": offer.to_dict(self.engine.vocabulary)["entities"],
+            "weights": self.engine.weights,
+            "matcher": [matcher.store.model_name, matcher.threshold] if matcher is not None else None,
+        })
+
+    def _stored_hashes(self, offer_id: str) -> Dict[str, str]:
+        rows = self._conn.execute(
+            "SELECT candidate_id, entities_hash FROM ranking_entries WHERE offer_id = ?", (offer_id,)
+        )
+        return dict(rows.fetchall())
+
+    def _stored_applicants(self, offer_id: str) -> List[Dict[str, Any]]:
+        rows = self._conn.execute(
+            "SELECT candidate_id, entities FROM ranking_entries WHERE offer_id = ?", (offer_id,)
+        )
+        return [{"candidate_id": cid, "entities": json.loads(entities)} for cid, entities in rows]
+
+    def update(self, job_offer: Dict[str, Any], applicants: Sequence[Dict[str, Any]]) -> int:
+        """
+        Score the new (or changed) applicants of an offer and store them; rescore every
+        stored candidate first if the offer fingerprint changed. Returns the number scored.
+        """
+        offer = OfferRecord.from_dict(job_offer, self.engine.vocabulary)
+        fingerprint = self.fingerprint(offer)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint FROM ranking_offers WHERE offer_id = ?", (offer.offer_id,)
+            ).fetchone()
+            # Offre modifiée : on renote tout le vivier à partir des entités stockées
+            rescore = row is not None and row[0] != fingerprint
+            if rescore:
+                stored = self._stored_applicants(offer.offer_id)
+                print(f"Classement - Offre {offer.offer_id} modifiée, {len(stored)} candidats à renoter")
+                latest = {a.get("candidate_id"): a for a in applicants if "entities" in a}
+                applicants = [a for a in stored if a["candidate_id"] not in latest] + list(latest.values())
+
+            known = {} if rescore else self._stored_hashes(offer.offer_id)
+            fresh, hashes = [], []
+            for applicant in applicants:
+                if "entities" not in applicant:
+                    continue
+                entities_hash = _hash(applicant["entities"])
+                if known.get(str(applicant.get("candidate_id"))) != entities_hash:
+                    fresh.append(applicant)
+                    hashes.append(entities_hash)
+
+            # Notation avant toute écriture : un échec laisse l'index intact
+            candidates = [CandidateRecord.from_dict(a, self.engine.vocabulary) for a in fresh]
+            totals, entries, rows = self.engine.score(offer, candidates)
+            self._conn.execute("BEGIN")
+            try:
+                if rescore:
+                    self._conn.execute("DELETE FROM ranking_entries WHERE offer_id = ?", (offer.offer_id,))
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO ranking_entries "
+                    "(offer_id, candidate_id, score, entities_hash, entities, entry, features, review) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, NULL)",
+                    [
+                        (offer.offer_id, entry["candidate_id"], float(total), entities_hash,
+                         json.dumps(applicant["entities"], ensure_ascii=False),
+                         json.dumps(entry, ensure_ascii=False), json.dumps(features))
+                        for total, entry, features, entities_hash, applicant
+                        in zip(totals, entries, rows, hashes, fresh)
+                    ]
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO ranking_offers (offer_id, fingerprint, updated) VALUES (?, ?, ?)",
+                    (offer.offer_id, fingerprint, time.time())
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        print(f"Classement - {len(fresh)} candidats notés, {len(known)} déjà dans l'index")
+        return len(fresh)
+
+    def _rows(self, offer_id: str, limit: int = -1) -> List[Tuple[float, Dict[str, Any], Optional[Dict[str, Any]]]]:
+        rows = self._conn.execute(
+            "SELECT score, entry, review FROM ranking_entries WHERE offer_id = ? "
+            "ORDER BY score DESC, rowid LIMIT ?", (offer_id, limit)
+        )
+        return [(score, json.loads(entry), json.loads(review) if review else None) for score, entry, review in rows]
+
+    def ranking(self, job_offer: Dict[str, Any], top_n: Optional[int] = None,
+                failed: Sequence[Dict[str, Any]] = ()) -> Dict[str, Any]:
+        """
+        Stored ranking of an offer in the rank_task output shape. Reviewed candidates use
+        their LLM score, so the order is the prefilter order merged with the reviewed ones.
+        """
+        offer = OfferRecord.from_dict(job_offer, self.engine.vocabulary)
+        with self._lock:
+            rows = self._rows(offer.offer_id)
+        candidates = []
+        for order, (score, entry, review) in enumerate(rows):
+            if review is not None:
+                entry.update(score=f"{review['score']}%", tier=tier_for(review["score"]))
+                if review["summary"]:
+                    entry["summary"] = review["summary"]
+                score = review["score"]
+            candidates.append((-score, order, entry))
+        if top_n is not None:
+            selected = heapq.nsmallest(top_n, candidates)
+        else:
+            selected = sorted(candidates)
+        ranked = [entry for _, _, entry in selected]
+        ranked.extend(failed_entry(item) for item in failed)
+        return {"job_offer": offer.to_dict(self.engine.vocabulary), "candidates": ranked}
+
+    def entities(self, offer_id: str, candidate_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        if not candidate_ids:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT candidate_id, entities FROM ranking_entries WHERE offer_id = ? "
+                f"AND candidate_id IN ({','.join('?' * len(candidate_ids))})",
+                (str(offer_id), *candidate_ids)
+            ).fetchall()
+        return {cid: json.loads(entities) for cid, entities in rows}
+
+    def reviewed(self, offer_id: str) -> set:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT candidate_id FROM ranking_entries WHERE offer_id = ? AND review IS NOT NULL", (str(offer_id),)
+            ).fetchall()
+        return {cid for cid, in rows}
+
+    def save_reviews(self, offer_id: str, reviews: Dict[str, Dict[str, Any]]):
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE ranking_entries SET review = ? WHERE offer_id = ? AND candidate_id = ?",
+                [(json.dumps(review, ensure_ascii=False), str(offer_id), cid) for cid, review in reviews.items()]
+            )
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_ranking_index() -> Optional[RankingIndex]:
+    global _index
+    if not RANKING_INDEX_ENABLED:
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = RankingIndex()
+        return _index
@@ -0,0 +1,158 @@
+"""
+Compact typed records for offers and candidates.
+
+Skills are held as sorted arrays of interned skill ids (see skill_vocabulary) rather than
+lists of strings; text fields are tuples. Serialization converts ids back to canonical
+names, since ids are only meaningful inside one process.
+"""
+
+import json
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.utils.skill_vocabulary import SkillVocabulary, get_skill_vocabulary
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _skill_array(vocabulary: SkillVocabulary, phrases: Iterable[str]) -> array:
+    return array("I", sorted(vocabulary.ids(phrases or [])))
+
+
+def _first(value: Any) -> str:
+    if isinstance(value, list):
+        return str(value[0]).strip() if value else ""
+    return str(value or "").strip()
+
+
+def _texts(value: Any) -> Tuple[str, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(str(v) for v in value)
+
+
+@dataclass(slots=True)
+class CandidateRecord:
+    candidate_id: str
+    first_name: str = ""
+    last_name: str = ""
+    email: str = ""
+    hard_skills: array = field(default_factory=lambda: array("I"))
+    soft_skills: array = field(default_factory=lambda: array("I"))
+    experience: Tuple[str, ...] = ()
+    education: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], vocabulary: Optional[SkillVocabulary] = None) -> "CandidateRecord":
+        """Build from the CVEntityExtractor output shape: {"candidate_id", "entities": {FNAME, HSKILL, ...}}."""
+        vocabulary = vocabulary or get_skill_vocabulary()
+        entities = data.get("entities") or {}
+        return cls(
+            candidate_id=str(data.get("candidate_id")),
+            first_name=_first(entities.get("FNAME")),
+            last_name=_first(entities.get("LNAME")),
+            email=_first(entities.get("EMAIL")),
+            hard_skills=_skill_array(vocabulary, entities.get("HSKILL")),
+            soft_skills=_skill_array(vocabulary, entities.get("SSKILL")),
+            experience=_texts(entities.get("EXPERIENCE")),
+            education=_texts(entities.get("EDUCATION")),
+        )
+
+    def to_dict(self, vocabulary: Optional[SkillVocabulary] = None) -> Dict[str, Any]:
+        vocabulary = vocabulary or get_skill_vocabulary()
+        return {
+            "candidate_id": self.candidate_id,
+            "entities": {
+                "FNAME": [self.first_name] if self.first_name else [],
+                "LNAME": [self.last_name] if self.last_name else [],
+                "EMAIL": [self.email] if self.email else [],
+                "HSKILL": [vocabulary.name(i) for i in self.hard_skills],
+                "SSKILL": [vocabulary.name(i) for i in self.soft_skills],
+                "EXPERIENCE": list(self.experience),
+                "EDUCATION": list(self.education),
+            }
+        }
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}".strip()
+
+
+@dataclass(slots=True)
+class OfferRecord:
+    offer_id: str
+    title: str = ""
+    hard_skills: array = field(default_factory=lambda: array("I"))
+    soft_skills: array = field(default_factory=lambda: array("I"))
+    experience: Tuple[str, ...] = ()
+    education: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], vocabulary: Optional[SkillVocabulary] = None) -> "OfferRecord":
+        """Build from the job offer task output: {"offer_id"/"id", "offer_title"/"title", "entities": {...}}."""
+        vocabulary = vocabulary or get_skill_vocabulary()
+        entities = data.get("entities") or {}
+        return cls(
+            offer_id=str(data.get("offer_id") or data.get("id")),
+            title=data.get("offer_title") or data.get("title") or "",
+            hard_skills=_skill_array(vocabulary, entities.get("hard_skills")),
+            soft_skills=_skill_array(vocabulary, entities.get("soft_skills")),
+            experience=_texts(entities.get("experience")),
+            education=_texts(entities.get("education")),
+        )
+
+    def to_dict(self, vocabulary: Optional[SkillVocabulary] = None) -> Dict[str, Any]:
+        vocabulary = vocabulary or get_skill_vocabulary()
+        return {
+            "offer_id": self.offer_id,
+            "offer_title": self.title,
+            "entities": {
+                "hard_skills": [vocabulary.name(i) for i in self.hard_skills],
+                "soft_skills": [vocabulary.name(i) for i in self.soft_skills],
+                "experience": list(self.experience),
+                "education": list(self.education),
+            }
+        }
+
+
+def _plain(data: Any) -> Any:
+    if isinstance(data, (CandidateRecord, OfferRecord)):
+        return data.to_dict()
+    if isinstance(data, list):
+        return [_plain(d) for d in data]
+    return data
+
+
+def dumps(data: Any) -> bytes:
+    """JSON-encode (orjson when installed); records are converted with to_dict()."""
+    data = _plain(data)
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_candidates(data: bytes, vocabulary: Optional[SkillVocabulary] = None) -> List[CandidateRecord]:
+    return [CandidateRecord.from_dict(d, vocabulary) for d in loads(data)]
+
+
+def dumps_msgpack(data: Any) -> bytes:
+    import msgpack
+
+    return msgpack.packb(_plain(data), use_bin_type=True)
+
+
+def loads_msgpack(data: bytes) -> Any:
+    import msgpack
+
+    return msgpack.unpackb(data, raw=False)
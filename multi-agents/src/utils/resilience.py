@@ -0,0 +1,247 @@
+"""
+Resilience for calls to internal services: per-call deadline, retries with jittered
+exponential backoff, optional hedged duplicate requests past the observed latency
+quantile, and a per-endpoint circuit breaker. Counters are kept per endpoint.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+from src.config.settings import (
+    HTTP_DEADLINE, HTTP_RETRIES, HTTP_BACKOFF_BASE, HTTP_BACKOFF_MAX,
+    HTTP_HEDGE_ENABLED, HTTP_HEDGE_QUANTILE, HTTP_HEDGE_MIN_SAMPLES,
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+)
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Connection problems, timeouts, 5xx and 429 are retried; other HTTP errors, bad response
+    bodies and invalid URLs are not (every requests exception is an OSError, so match precisely).
+    """
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is not None:
+        return status >= 500 or status == 429
+    if isinstance(error, TimeoutError):
+        return True
+    try:
+        import requests
+    except ImportError:
+        pass
+    else:
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True
+    try:
+        import httpx
+    except ImportError:
+        return False
+    return isinstance(error, httpx.TransportError) and not isinstance(error, httpx.UnsupportedProtocol)
+
+
+def signals_outage(error: Exception) -> bool:
+    """
+    Failures that say the service itself is unavailable: connection problems, timeouts,
+    503 and 429. A 500 usually comes from one bad input and must not open the circuit.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is not None:
+        return status in (429, 503)
+    return is_retryable(error)
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures; lets one probe through after `reset_timeout`."""
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+
+class LatencyWindow:
+    """Latencies of the last successful calls, for the hedging threshold."""
+
+    def __init__(self, size: int = 200):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, elapsed: float):
+        with self._lock:
+            self._samples.append(elapsed)
+
+    def quantile(self, q: float, min_samples: int) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class ResiliencePolicy:
+
+    def __init__(self, retries: int = HTTP_RETRIES, backoff_base: float = HTTP_BACKOFF_BASE,
+                 backoff_max: float = HTTP_BACKOFF_MAX, deadline: float = HTTP_DEADLINE,
+                 hedge: bool = HTTP_HEDGE_ENABLED, hedge_quantile: float = HTTP_HEDGE_QUANTILE,
+                 hedge_min_samples: int = HTTP_HEDGE_MIN_SAMPLES):
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._windows: Dict[str, LatencyWindow] = {}
+        self._metrics: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._hedge_pool = None
+
+    def _state(self, endpoint: str):
+        with self._lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker()
+                self._windows[endpoint] = LatencyWindow()
+                self._metrics[endpoint] = dict.fromkeys(
+                    ("calls", "attempts", "retries", "failures", "hedges", "hedge_wins",
+                     "circuit_rejections", "deadline_exceeded"), 0)
+            return self._breakers[endpoint], self._windows[endpoint], self._metrics[endpoint]
+
+    def _count(self, metrics: Dict[str, int], key: str):
+        with self._lock:
+            metrics[key] += 1
+
+    def call(self, endpoint: str, attempt: Callable[[float], Any], timeout: float,
+             deadline: Optional[float] = None) -> Any:
+        """
+        Run `attempt(per_try_timeout)` under the policy. `timeout` caps each try,
+        `deadline` (seconds, default HTTP_DEADLINE) caps the whole call including backoff.
+        """
+        breaker, window, metrics = self._state(endpoint)
+        self._count(metrics, "calls")
+        deadline_at = time.monotonic() + (deadline or self.deadline)
+        last_error = None
+
+        for try_number in range(self.retries + 1):
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                self._count(metrics, "deadline_exceeded")
+                raise DeadlineExceeded(f"{endpoint}: deadline exceeded ({last_error})")
+            if not breaker.allow():
+                self._count(metrics, "circuit_rejections")
+                raise CircuitOpenError(f"{endpoint}: circuit open after repeated failures ({last_error})")
+
+            self._count(metrics, "attempts")
+            start = time.monotonic()
+            try:
+                result = self._attempt(attempt, min(timeout, remaining), window, metrics)
+            except Exception as e:
+                last_error = e
+                if not is_retryable(e):
+                    # Le service a répondu : il n'est pas en panne
+                    breaker.record_success()
+                    raise
+                if signals_outage(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                self._count(metrics, "failures")
+                if try_number == self.retries:
+                    raise
+                backoff = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** try_number))
+                time.sleep(max(0.0, min(backoff, deadline_at - time.monotonic())))
+                self._count(metrics, "retries")
+                continue
+
+            breaker.record_success()
+            window.add(time.monotonic() - start)
+            return result
+
+    def _attempt(self, attempt: Callable[[float], Any], timeout: float, window: LatencyWindow,
+                 metrics: Dict[str, int]) -> Any:
+        hedge_after = window.quantile(self.hedge_quantile, self.hedge_min_samples) if self.hedge else None
+        if hedge_after is None or hedge_after >= timeout:
+            return attempt(timeout)
+
+        with self._lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hedge")
+        primary = self._hedge_pool.submit(attempt, timeout)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        # Requête doublée : la première réponse valide l'emporte
+        self._count(metrics, "hedges")
+        hedge = self._hedge_pool.submit(attempt, max(0.001, timeout - hedge_after))
+        pending, error = {primary, hedge}, None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if future is hedge:
+                    self._count(metrics, "hedge_wins")
+                return result
+        raise error
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                endpoint: {
+                    **metrics,
+                    "circuit": self._breakers[endpoint].state,
+                    "p95_s": self._windows[endpoint].quantile(0.95, 1)
+                }
+                for endpoint, metrics in self._metrics.items()
+            }
+
+
+default_policy = ResiliencePolicy()
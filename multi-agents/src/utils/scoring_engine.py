@@ -0,0 +1,292 @@
+"""
+Deterministic, vectorized implementation of the rank_task rubric.
+
+Each criterion is worth 0-3 points:
+- hard / soft skills: share of the offer's skills found in the CV, exactly or, with
+  SKILL_EMBEDDINGS_ENABLED, through a semantically close skill (3 = >=80%, 2 = 50-79%,
+  1 = 20-49%, 0 = <20%)
+- experience: years of experience against the years required by the offer, and share of
+  the offer's hard skills mentioned in the experience entries
+- education: highest degree level against the level required by the offer
+The total is the weighted mean of the points, scaled to 0-100%, then tiered at 85/70/50.
+A criterion the offer says nothing about is left out of the weighted mean.
+"""
+
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from src.config.settings import (
+    SCORE_WEIGHT_HARD_SKILLS, SCORE_WEIGHT_SOFT_SKILLS, SCORE_WEIGHT_EXPERIENCE, SCORE_WEIGHT_EDUCATION
+)
+from src.utils.records import CandidateRecord, OfferRecord
+from src.utils.skill_vocabulary import SkillVocabulary, get_skill_vocabulary
+from src.utils.skill_embeddings import SemanticSkillMatcher, get_skill_matcher
+
+OVERLAP_THRESHOLDS = np.array([0.2, 0.5, 0.8])
+TIERS = ((85, "Tier 1"), (70, "Tier 2"), (50, "Tier 3"), (0, "Tier 4"))
+
+_MONTHS = {
+    "jan": 1, "janv": 1, "january": 1, "janvier": 1,
+    "feb": 2, "fev": 2, "fév": 2, "févr": 2, "february": 2, "février": 2, "fevrier": 2,
+    "mar": 3, "mars": 3, "march": 3,
+    "apr": 4, "avr": 4, "april": 4, "avril": 4,
+    "may": 5, "mai": 5,
+    "jun": 6, "juin": 6, "june": 6,
+    "jul": 7, "juil": 7, "july": 7, "juillet": 7,
+    "aug": 8, "aou": 8, "aoû": 8, "août": 8, "august": 8,
+    "sep": 9, "sept": 9, "september": 9, "septembre": 9,
+    "oct": 10, "october": 10, "octobre": 10,
+    "nov": 11, "november": 11, "novembre": 11,
+    "dec": 12, "déc": 12, "december": 12, "décembre": 12, "decembre": 12,
+}
+_MONTH = r"(?:[a-zéûè]+\.?)"
+_YEAR = r"(?:19|20)\d{2}"
+_ONGOING = r"(?:en cours|present|présent|aujourd'hui|now|current|actuel(?:lement)?|today)"
+_DATE_RANGE = re.compile(
+    rf"(?:(?P<m1>{_MONTH})\s+)?(?P<y1>{_YEAR})\s*[-–—]+\s*(?:(?P<m2>{_MONTH})\s+)?(?P<y2>{_YEAR}|{_ONGOING})"
+    rf"|(?P<m3>{_MONTH})\s*[-–—]+\s*(?P<m4>{_MONTH})\s+(?P<y3>{_YEAR})"
+)
+_YEARS = re.compile(r"(\d{1,2})\s*\+?\s*(?:years?|yrs?|ans|années?)")
+
+# Niveaux de diplôme (bac+N)
+_EDUCATION_LEVELS = (
+    (8, re.compile(r"doctorat|doctorate|ph\.?\s?d")),
+    (5, re.compile(r"master|mast[eè]re|msc|m\.sc|mba|ing[ée]nieur|engineering degree|bac\s*\+\s*5")),
+    (3, re.compile(r"licence|license|bachelor|bsc|b\.sc|bac\s*\+\s*3")),
+    (2, re.compile(r"\bdut\b|\bbts\b|\bdeug\b|bac\s*\+\s*2|associate degree")),
+    (0, re.compile(r"baccalaur|high school|\bbac\b")),
+)
+_LEVEL_LADDER = [0, 2, 3, 5, 8]
+_LEVEL_LABELS = {0: "baccalaureate", 2: "bac+2", 3: "bachelor", 5: "master/engineer", 8: "doctorate"}
+
+
+def _month(token: Optional[str], default: int) -> int:
+    if not token:
+        return default
+    return _MONTHS.get(token.rstrip(".").lower(), default)
+
+
+def experience_years(entries: Sequence[str], today: Optional[date] = None) -> float:
+    """Years of experience from date ranges (overlaps merged) or explicit "N years" mentions."""
+    today = today or date.today()
+    text = "\n".join(entries).lower()
+    intervals = []
+    for m in _DATE_RANGE.finditer(text):
+        if m.group("y3"):
+            year = int(m.group("y3"))
+            start = year * 12 + _month(m.group("m3"), 1)
+            end = year * 12 + _month(m.group("m4"), 12)
+        else:
+            start = int(m.group("y1")) * 12 + _month(m.group("m1"), 1)
+            if m.group("y2")[0].isdigit():
+                end = int(m.group("y2")) * 12 + _month(m.group("m2"), 12)
+            else:
+                end = today.year * 12 + today.month
+        if end >= start:
+            intervals.append((start, end + 1))
+
+    months, current_end = 0, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            months += end - start
+            current_end = end
+        elif end > current_end:
+            months += end - current_end
+            current_end = end
+
+    explicit = [int(n) for n in _YEARS.findall(text)]
+    return max(months / 12, max(explicit, default=0))
+
+
+def required_years(entries: Sequence[str]) -> Optional[float]:
+    found = [int(n) for n in _YEARS.findall("\n".join(entries).lower())]
+    return float(max(found)) if found else None
+
+
+def education_level(entries: Sequence[str]) -> int:
+    """Highest degree level mentioned (bac+N), -1 when none is recognised."""
+    text = "\n".join(entries).lower()
+    return max((level for level, pattern in _EDUCATION_LEVELS if pattern.search(text)), default=-1)
+
+
+def overlap_points(ratio: np.ndarray) -> np.ndarray:
+    return np.searchsorted(OVERLAP_THRESHOLDS, ratio, side="right").astype(np.int8)
+
+
+def tier_for(score: float) -> str:
+    return next(label for threshold, label in TIERS if score >= threshold)
+
+
+def failed_entry(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Unreadable CVs stay in the ranking, last, with a zero score."""
+    return {
+        "candidate_id": item.get("candidate_id"),
+        "full_name": "",
+        "email": "",
+        "score": "0%",
+        "tier": tier_for(0),
+        "summary": f"CV could not be processed: {item.get('error', 'unknown error')}"
+    }
+
+
+class ScoringEngine:
+
+    def __init__(self, vocabulary: Optional[SkillVocabulary] = None,
+                 weights: Optional[Dict[str, float]] = None,
+                 matcher: Optional[SemanticSkillMatcher] = None):
+        self.vocabulary = vocabulary or get_skill_vocabulary()
+        # Synonymes non couverts par les alias ("postgres" ~ "postgresql") si les embeddings sont activés
+        self.matcher = matcher if matcher is not None else get_skill_matcher()
+        self.weights = weights or {
+            "hard_skills": SCORE_WEIGHT_HARD_SKILLS,
+            "soft_skills": SCORE_WEIGHT_SOFT_SKILLS,
+            "experience": SCORE_WEIGHT_EXPERIENCE,
+            "education": SCORE_WEIGHT_EDUCATION,
+        }
+
+    def _incidence(self, skill_lists: Sequence[Sequence[int]], columns: np.ndarray) -> np.ndarray:
+        """Candidate x `columns` boolean matrix; `columns` are sorted, unique skill ids."""
+        rows = np.repeat(np.arange(len(skill_lists)), [len(s) for s in skill_lists])
+        ids = np.fromiter((i for s in skill_lists for i in s), dtype=np.int64, count=len(rows))
+        positions = np.searchsorted(columns, ids)
+        hit = positions < len(columns)
+        hit[hit] = columns[positions[hit]] == ids[hit]
+        matrix = np.zeros((len(skill_lists), len(columns)), dtype=bool)
+        matrix[rows[hit], positions[hit]] = True
+        return matrix
+
+    def _mentioned(self, texts: Sequence[str]) -> List[int]:
+        """Known skill ids cited in free text; unknown word runs are not interned."""
+        found = {self.vocabulary.get_id(name) for text in texts for name in self.vocabulary.mentions(text)}
+        found.discard(None)
+        return sorted(found)
+
+    def _skill_ratio(self, skill_lists, offer_skills, semantic: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        columns = np.asarray(offer_skills, dtype=np.int64)
+        if semantic and self.matcher is not None:
+            # Seules les compétences présentes dans le vivier ont une colonne
+            used = np.unique(np.fromiter((i for s in skill_lists for i in s), dtype=np.int64))
+            matched = self.matcher.match(self._incidence(skill_lists, used), used, columns)
+        else:
+            matched = self._incidence(skill_lists, columns)
+        if not len(columns):
+            return np.zeros(len(skill_lists)), matched
+        return matched.sum(axis=1) / len(columns), matched
+
+    def features(self, offer: OfferRecord, candidates: Sequence[CandidateRecord]) -> Dict[str, Any]:
+        """Per-criterion ratios, points and raw features for all candidates at once."""
+        hard_ratio, hard_matched = self._skill_ratio([c.hard_skills for c in candidates], offer.hard_skills, True)
+        soft_ratio, soft_matched = self._skill_ratio([c.soft_skills for c in candidates], offer.soft_skills, True)
+
+        # Expérience : durée et compétences de l'offre citées dans les expériences
+        experience_skills = [self._mentioned(c.experience) for c in candidates]
+        relevance_ratio, _ = self._skill_ratio(experience_skills, offer.hard_skills)
+        years = np.array([experience_years(c.experience) for c in candidates], dtype=float)
+        required = required_years(offer.experience)
+        relevance_points = overlap_points(relevance_ratio)
+        if required:
+            duration_points = np.searchsorted(np.array([1 / 3, 2 / 3, 1.0]), years / required, side="right")
+            experience_points = np.rint((duration_points + relevance_points) / 2).astype(np.int8)
+        else:
+            experience_points = relevance_points
+
+        # Formation : écart entre niveau du candidat et niveau demandé
+        levels = np.array([education_level(c.education) for c in candidates])
+        required_level = education_level(offer.education)
+        ladder = np.array(_LEVEL_LADDER)
+        if required_level >= 0:
+            gap = np.searchsorted(ladder, required_level) - np.searchsorted(ladder, np.maximum(levels, 0))
+            education_points = np.where(levels < 0, 0, np.clip(3 - np.maximum(gap, 0), 0, 3)).astype(np.int8)
+        else:
+            education_points = np.zeros(len(candidates), dtype=np.int8)
+
+        return {
+            "hard_skills": overlap_points(hard_ratio), "hard_ratio": hard_ratio, "hard_matched": hard_matched,
+            "soft_skills": overlap_points(soft_ratio), "soft_ratio": soft_ratio, "soft_matched": soft_matched,
+            "experience": experience_points, "years": years, "required_years": required,
+            "education": education_points, "levels": levels, "required_level": required_level,
+        }
+
+    def applicable(self, offer: OfferRecord) -> Dict[str, bool]:
+        return {
+            "hard_skills": len(offer.hard_skills) > 0,
+            "soft_skills": len(offer.soft_skills) > 0,
+            "experience": bool(offer.experience) or len(offer.hard_skills) > 0,
+            "education": education_level(offer.education) >= 0,
+        }
+
+    def scores(self, offer: OfferRecord, features: Dict[str, Any]) -> np.ndarray:
+        """Weighted total in percent for every candidate."""
+        criteria = [name for name, used in self.applicable(offer).items() if used]
+        if not criteria:
+            return np.zeros(len(features["years"]))
+        points = np.stack([features[name] for name in criteria], axis=1).astype(float)
+        weights = np.array([self.weights[name] for name in criteria])
+        return np.rint(points @ weights / (3 * weights.sum()) * 100)
+
+    def score(self, offer: OfferRecord, candidates: Sequence[CandidateRecord]
+              ) -> Tuple[np.ndarray, List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Totals, output entries and per-candidate feature rows, in input order."""
+        if not candidates:
+            return np.zeros(0), [], []
+        features = self.features(offer, candidates)
+        totals = self.scores(offer, features)
+        entries = [self._entry(offer, c, features, i, float(totals[i])) for i, c in enumerate(candidates)]
+        rows = [self.feature_row(features, i) for i in range(len(candidates))]
+        return totals, entries, rows
+
+    def feature_row(self, features: Dict[str, Any], i: int) -> Dict[str, Any]:
+        return {
+            "hard_skills": int(features["hard_skills"][i]),
+            "soft_skills": int(features["soft_skills"][i]),
+            "experience": int(features["experience"][i]),
+            "education": int(features["education"][i]),
+            "hard_ratio": round(float(features["hard_ratio"][i]), 4),
+            "soft_ratio": round(float(features["soft_ratio"][i]), 4),
+            "years": round(float(features["years"][i]), 2),
+            "education_level": int(features["levels"][i]),
+        }
+
+    def rank(self, offer: OfferRecord, candidates: Sequence[CandidateRecord],
+             failed: Sequence[Dict[str, Any]] = ()) -> Dict[str, Any]:
+        """Score, tier and sort every candidate; returns the rank_task output shape."""
+        totals, entries, _ = self.score(offer, candidates)
+        ranked = [entries[i] for i in np.argsort(-totals, kind="stable")]
+        ranked.extend(failed_entry(item) for item in failed)
+        return {"job_offer": offer.to_dict(self.vocabulary), "candidates": ranked}
+
+    def _entry(self, offer, candidate, features, i, total) -> Dict[str, Any]:
+        return {
+            "candidate_id": candidate.candidate_id,
+            "full_name": candidate.full_name,
+            "email": candidate.email,
+            "score": f"{int(total)}%",
+            "tier": tier_for(total),
+            "summary": self.summary(offer, features, i)
+        }
+
+    def summary(self, offer: OfferRecord, features: Dict[str, Any], i: int) -> str:
+        parts = []
+        if len(offer.hard_skills):
+            matched = [self.vocabulary.name(s) for s, hit in zip(offer.hard_skills, features["hard_matched"][i]) if hit]
+            listed = f" ({', '.join(matched[:8])}{', ...' if len(matched) > 8 else ''})" if matched else ""
+            parts.append(f"hard skills {len(matched)}/{len(offer.hard_skills)}{listed}")
+        if len(offer.soft_skills):
+            parts.append(f"soft skills {int(features['soft_matched'][i].sum())}/{len(offer.soft_skills)}")
+        years = features["years"][i]
+        required = features["required_years"]
+        experience = f"experience ~{years:.1f} years" if years else "no dated experience"
+        parts.append(experience + (f" ({required:g} required)" if required else ""))
+        level = int(features["levels"][i])
+        parts.append(f"education: {_LEVEL_LABELS.get(level, 'not identified')}")
+        return "Matched " + "; ".join(parts) + "."
+
+
+def rank_candidates(job_offer: Dict[str, Any], applicants: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Rank CVEntityExtractor results (`applicants`) against a job offer dict."""
+    engine = ScoringEngine()
+    offer = OfferRecord.from_dict(job_offer, engine.vocabulary)
+    failed = [a for a in applicants if "error" in a and "entities" not in a]
+    candidates = [CandidateRecord.from_dict(a, engine.vocabulary) for a in applicants if "entities" in a]
+    return engine.rank(offer, candidates, failed)
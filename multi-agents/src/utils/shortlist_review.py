@@ -0,0 +1,84 @@
+"""
+Second stage of the ranking: the LLM re-scores and summarises only the shortlist.
+
+The deterministic engine ranks every applicant; the top RANK_LLM_TOP_K entries are sent
+to the LLM in a single call together with their entities and the rule-based score, and
+the LLM score and summary replace the rule-based ones for those candidates only. The
+rest keep their code-generated summaries. Any LLM failure leaves the ranking unchanged.
+"""
+
+import json
+import re
+from typing import Any, Collection, Dict
+from src.utils.scoring_engine import tier_for
+
+REVIEW_PROMPT = (
+    "You are reviewing the shortlist of a job offer. A rule-based prefilter already scored these "
+    "candidates on hard skills, soft skills, experience and education (0-3 points each, weighted, "
+    "scaled to 0-100%). Refine each score by judging relevance the rules cannot see (related "
+    "technologies, seniority, field of study) and write a brief justification.\n\n"
+    "Job offer:\n{offer}\n\n"
+    "Candidates:\n{candidates}\n\n"
+    "Return ONLY a JSON array, one object per candidate: "
+    "{{\"candidate_id\": <id as given>, \"score\": <integer 0-100>, \"summary\": <one or two sentences>}}. "
+    "DO NOT invent data that is not in the candidate entities."
+)
+
+
+def _parse_reviews(text: str) -> Dict[str, Dict[str, Any]]:
+    text = re.sub(r"^```(?:json)?|```$", "", text.strip(), flags=re.MULTILINE).strip()
+    reviews = {}
+    for item in json.loads(text):
+        score = int(round(float(str(item["score"]).rstrip("%"))))
+        reviews[str(item["candidate_id"])] = {
+            "score": min(max(score, 0), 100),
+            "summary": str(item.get("summary") or "").strip()
+        }
+    return reviews
+
+
+def review_shortlist(ranking: Dict[str, Any], entities: Dict[str, Dict[str, Any]], top_k: int,
+                     llm=None, reviewed: Collection[str] = ()) -> Dict[str, Dict[str, Any]]:
+    """
+    Re-score the first `top_k` candidates of `ranking` with the LLM, in place, and re-sort.
+    `entities` maps candidate_id to the CV entities sent to the LLM; candidates in `reviewed`
+    already carry an LLM score and are skipped. Returns the reviews applied, by candidate_id.
+    """
+    shortlist = [
+        c for c in ranking["candidates"][:top_k]
+        if c["candidate_id"] in entities and c["candidate_id"] not in reviewed
+    ]
+    if not shortlist:
+        return {}
+    if llm is None:
+        from src.config.llm_config import llm
+
+    candidates = [
+        {"candidate_id": c["candidate_id"], "prefilter_score": c["score"], "entities": entities[c["candidate_id"]]}
+        for c in shortlist
+    ]
+    prompt = REVIEW_PROMPT.format(
+        offer=json.dumps(ranking["job_offer"], ensure_ascii=False),
+        candidates=json.dumps(candidates, ensure_ascii=False)
+    )
+    try:
+        reviews = _parse_reviews(llm.call([{"role": "user", "content": prompt}]))
+    except Exception as e:
+        print(f"Classement - Revue LLM ignorée ({e}), scores du pré-classement conservés")
+        return {}
+
+    applied = {}
+    for candidate in shortlist:
+        review = reviews.get(str(candidate["candidate_id"]))
+        if review is None:
+            continue
+        candidate["score"] = f"{review['score']}%"
+        candidate["tier"] = tier_for(review["score"])
+        if review["summary"]:
+            candidate["summary"] = review["summary"]
+        applied[candidate["candidate_id"]] = review
+
+    # Tri stable : à score égal, l'ordre du pré-classement est conservé
+    ranking["candidates"].sort(key=lambda c: -int(c["score"].rstrip("%")))
+    print(f"Classement - {len(applied)}/{len(ranking['candidates'])} candidats revus par le LLM")
+    return applied
@@ -0,0 +1,129 @@
+"""
+Semantic skill matching on top of the canonical vocabulary.
+
+Every distinct canonical skill is embedded once with EMBEDDING_MODEL_NAME; vectors are
+L2-normalized and persisted by skill name (ids are process-local) in an .npz file, so later
+runs only embed skills never seen before. Matching a whole candidate pool against an offer
+is one cosine-similarity product between the skills in use and the offer's skills, then one
+incidence x similarity product for all candidates.
+"""
+
+import os
+import threading
+from typing import Dict, Optional, Sequence
+import numpy as np
+from src.config.settings import (
+    EMBEDDING_MODEL_NAME, SKILL_EMBEDDINGS_ENABLED, SKILL_EMBEDDINGS_PATH, SKILL_SIMILARITY_THRESHOLD
+)
+from src.utils.skill_vocabulary import SkillVocabulary, get_skill_vocabulary
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+DEFAULT_MODEL_NAME = "OrdalieTech/Solon-embeddings-large-0.1"
+
+
+class SkillEmbeddingStore:
+    """Skill name -> normalized embedding, backed by one float32 matrix persisted to disk."""
+
+    def __init__(self, model_name: str, path: Optional[str] = SKILL_EMBEDDINGS_PATH, encoder=None):
+        self.model_name = model_name
+        self.path = path
+        self._encoder = encoder
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        with np.load(self.path, allow_pickle=False) as data:
+            # Vecteurs d'un autre modèle : inutilisables
+            if str(data["model"]) != self.model_name:
+                print(f"Embeddings - Modèle différent ({data['model']}), matrice ignorée")
+                return
+            self._matrix = data["vectors"].astype(np.float32, copy=False)
+            self._rows = {name: i for i, name in enumerate(data["names"].tolist())}
+
+    def _save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        names = np.array(sorted(self._rows, key=self._rows.get), dtype=str)
+        tmp = f"{self.path}.tmp.npz"
+        np.savez(tmp, model=np.array(self.model_name), names=names, vectors=self._matrix)
+        os.replace(tmp, self.path)
+
+    def _get_encoder(self):
+        if self._encoder is None:
+            if SentenceTransformer is None:
+                raise RuntimeError("sentence-transformers is required for semantic skill matching.")
+            self._encoder = SentenceTransformer(self.model_name, device="cpu")
+        return self._encoder
+
+    def __len__(self):
+        return len(self._rows)
+
+    def vectors(self, names: Sequence[str]) -> np.ndarray:
+        """Normalized embeddings for `names` (len(names) x dim); unseen names are embedded in one batch."""
+        with self._lock:
+            missing = list(dict.fromkeys(n for n in names if n not in self._rows))
+            if missing:
+                fresh = np.asarray(self._get_encoder().encode(missing, batch_size=64), dtype=np.float32)
+                fresh /= np.maximum(np.linalg.norm(fresh, axis=1, keepdims=True), 1e-12)
+                base = len(self._rows)
+                self._matrix = fresh if not base else np.vstack([self._matrix, fresh])
+                self._rows.update({name: base + i for i, name in enumerate(missing)})
+                self._save()
+                print(f"Embeddings - {len(missing)} nouvelles compétences encodées ({len(self._rows)} au total)")
+            return self._matrix[[self._rows[n] for n in names]]
+
+
+class SemanticSkillMatcher:
+
+    def __init__(self, store: SkillEmbeddingStore, vocabulary: Optional[SkillVocabulary] = None,
+                 threshold: float = SKILL_SIMILARITY_THRESHOLD):
+        self.store = store
+        self.vocabulary = vocabulary or get_skill_vocabulary()
+        self.threshold = threshold
+
+    def match(self, incidence: np.ndarray, used: Sequence[int], offer_skills: Sequence[int]) -> np.ndarray:
+        """
+        Candidate x offer-skill boolean matrix: an offer skill is matched when the candidate has
+        a skill whose cosine similarity with it reaches the threshold (identical skills always do).
+        `incidence` is the candidate x `used` boolean matrix, `used` the skill ids of the pool.
+        """
+        columns = np.asarray(offer_skills, dtype=np.int64)
+        used = np.asarray(used, dtype=np.int64)
+        if not len(columns) or not len(used):
+            return np.zeros((incidence.shape[0], len(columns)), dtype=bool)
+
+        names = self.vocabulary.name
+        candidate_vectors = self.store.vectors([names(i) for i in used])
+        offer_vectors = self.store.vectors([names(i) for i in columns])
+        similar = (candidate_vectors @ offer_vectors.T) >= self.threshold
+        similar |= used[:, None] == columns[None, :]
+
+        hits = incidence.astype(np.float32) @ similar.astype(np.float32)
+        return hits > 0
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_skill_matcher() -> Optional[SemanticSkillMatcher]:
+    """Process-wide matcher, or None when semantic matching is disabled or unavailable."""
+    global _matcher
+    if not SKILL_EMBEDDINGS_ENABLED:
+        return None
+    if SentenceTransformer is None:
+        print("Embeddings - sentence-transformers absent, correspondance exacte des compétences")
+        return None
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = SemanticSkillMatcher(SkillEmbeddingStore(EMBEDDING_MODEL_NAME or DEFAULT_MODEL_NAME))
+        return _matcher
@@ -0,0 +1,200 @@
+"""
+Inverted index from canonical hard skill to the candidates and offers that list it.
+
+Documents (a candidate's HSKILL, an offer's hard_skills) are indexed by canonical name,
+so the index survives across processes. Updating a document only touches the postings of
+the skills it gained or lost. A match query reads the postings of the query skills only:
+documents sharing no skill with the query are never looked at, and no CV is re-read.
+
+Matches are ranked by coverage (share of the query's skills the document has), then by
+precision (share of the document's skills that were asked for).
+"""
+
+import heapq
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+from src.config.settings import SKILL_INDEX_ENABLED, SKILL_INDEX_PATH, SKILL_INDEX_TOP_K
+from src.utils.skill_vocabulary import get_skill_vocabulary
+
+CANDIDATE = "candidate"
+OFFER = "offer"
+
+
+class SkillIndex:
+
+    def __init__(self, path: str = SKILL_INDEX_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS skill_postings ("
+            "skill TEXT NOT NULL, kind TEXT NOT NULL, doc_id TEXT NOT NULL, "
+            "PRIMARY KEY (skill, kind, doc_id)) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS skill_documents ("
+            "kind TEXT NOT NULL, doc_id TEXT NOT NULL, skills TEXT NOT NULL, size INTEGER NOT NULL, "
+            "updated REAL NOT NULL, PRIMARY KEY (kind, doc_id))"
+        )
+
+    def _skills(self, kind: str, doc_id: str) -> Optional[List[str]]:
+        row = self._conn.execute(
+            "SELECT skills FROM skill_documents WHERE kind = ? AND doc_id = ?", (kind, doc_id)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update(self, kind: str, doc_id: str, skills: Iterable[str]) -> bool:
+        """Index (or re-index) one document under its canonical skills; False when nothing changed."""
+        doc_id = str(doc_id)
+        names = sorted(set(get_skill_vocabulary().canonical_names(skills)))
+        with self._lock:
+            previous = self._skills(kind, doc_id)
+            if previous == names:
+                return False
+            old = set(previous or ())
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "DELETE FROM skill_postings WHERE skill = ? AND kind = ? AND doc_id = ?",
+                [(skill, kind, doc_id) for skill in old.difference(names)]
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO skill_postings (skill, kind, doc_id) VALUES (?, ?, ?)",
+                [(skill, kind, doc_id) for skill in set(names).difference(old)]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO skill_documents (kind, doc_id, skills, size, updated) VALUES (?, ?, ?, ?, ?)",
+                (kind, doc_id, json.dumps(names, ensure_ascii=False), len(names), time.time())
+            )
+            self._conn.execute("COMMIT")
+        return True
+
+    def remove(self, kind: str, doc_id: str):
+        """Drop a document, e.g. a closed offer or a deleted candidate."""
+        doc_id = str(doc_id)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM skill_postings WHERE kind = ? AND doc_id = ?", (kind, doc_id))
+            self._conn.execute("DELETE FROM skill_documents WHERE kind = ? AND doc_id = ?", (kind, doc_id))
+            self._conn.execute("COMMIT")
+
+    def add_candidate(self, candidate_id: str, hard_skills: Iterable[str]) -> bool:
+        return self.update(CANDIDATE, candidate_id, hard_skills)
+
+    def add_offer(self, offer_id: str, hard_skills: Iterable[str]) -> bool:
+        return self.update(OFFER, offer_id, hard_skills)
+
+    def match(self, skills: Iterable[str], kind: str, k: int = SKILL_INDEX_TOP_K,
+              exclude: Sequence[str] = ()) -> List[Dict[str, Any]]:
+        """Top-k documents of `kind` sharing the most of `skills` (raw or canonical names)."""
+        names = sorted(set(get_skill_vocabulary().canonical_names(skills)))
+        if not names:
+            return []
+        placeholders = ",".join("?" * len(names))
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT p.doc_id, COUNT(*), d.size, group_concat(p.skill, char(31)) FROM skill_postings p "
+                "JOIN skill_documents d ON d.kind = p.kind AND d.doc_id = p.doc_id "
+                f"WHERE p.kind = ? AND p.skill IN ({placeholders}) GROUP BY p.doc_id",
+                (kind, *names)
+            ).fetchall()
+        excluded = set(map(str, exclude))
+        return _top_k(
+            ((doc_id, count, size, matched) for doc_id, count, size, matched in rows if doc_id not in excluded),
+            len(names), k
+        )
+
+    def candidates_for_offer(self, offer_id: str, k: int = SKILL_INDEX_TOP_K,
+                             exclude: Sequence[str] = ()) -> List[Dict[str, Any]]:
+        """Who in the candidate base fits this offer (e.g. excluding those who already applied)."""
+        with self._lock:
+            skills = self._skills(OFFER, str(offer_id)) or []
+        return self.match(skills, CANDIDATE, k, exclude)
+
+    def offers_for_candidate(self, candidate_id: str, k: int = SKILL_INDEX_TOP_K) -> List[Dict[str, Any]]:
+        """Which indexed offers fit this candidate."""
+        with self._lock:
+            skills = self._skills(CANDIDATE, str(candidate_id)) or []
+        return self.match(skills, OFFER, k)
+
+    def match_offers_to_candidates(self, offer_ids: Optional[Sequence[str]] = None,
+                                   k: int = SKILL_INDEX_TOP_K) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Top-k candidates for many offers (all indexed offers by default) with a single
+        self-join of the postings on skill.
+        """
+        query = (
+            "SELECT o.doc_id, c.doc_id, COUNT(*), group_concat(c.skill, char(31)) FROM skill_postings o "
+            "JOIN skill_postings c ON c.skill = o.skill AND c.kind = ? "
+            "WHERE o.kind = ?"
+        )
+        params: list = [CANDIDATE, OFFER]
+        if offer_ids is not None:
+            if not offer_ids:
+                return {}
+            query += f" AND o.doc_id IN ({','.join('?' * len(offer_ids))})"
+            params.extend(map(str, offer_ids))
+        query += " GROUP BY o.doc_id, c.doc_id"
+
+        with self._lock:
+            sizes = {
+                (kind, doc_id): size
+                for kind, doc_id, size in self._conn.execute("SELECT kind, doc_id, size FROM skill_documents")
+            }
+            rows = self._conn.execute(query, params).fetchall()
+
+        per_offer = defaultdict(list)
+        for offer_id, candidate_id, count, matched in rows:
+            per_offer[offer_id].append((candidate_id, count, sizes.get((CANDIDATE, candidate_id), count), matched))
+        return {
+            offer_id: _top_k(hits, sizes.get((OFFER, offer_id), 1), k)
+            for offer_id, hits in per_offer.items()
+        }
+
+    def indexed_ids(self, kind: str) -> Set[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT doc_id FROM skill_documents WHERE kind = ?", (kind,)).fetchall()
+        return {doc_id for doc_id, in rows}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT kind, COUNT(*) FROM skill_documents GROUP BY kind").fetchall())
+            postings = self._conn.execute("SELECT COUNT(*) FROM skill_postings").fetchone()[0]
+        return {"candidates": counts.get(CANDIDATE, 0), "offers": counts.get(OFFER, 0), "postings": postings}
+
+
+def _top_k(hits, query_size: int, k: int) -> List[Dict[str, Any]]:
+    """hits: (doc_id, matched_count, doc_size, matched skills joined with \\x1f) tuples."""
+    best = heapq.nsmallest(
+        k, hits, key=lambda h: (-h[1] / query_size, -h[1] / max(h[2], 1), h[0])
+    )
+    return [
+        {
+            "id": doc_id,
+            "matched": sorted(matched.split("\x1f")),
+            "coverage": round(count / query_size, 4),
+            "precision": round(count / max(size, 1), 4),
+        }
+        for doc_id, count, size, matched in best
+    ]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_skill_index() -> Optional[SkillIndex]:
+    global _index
+    if not SKILL_INDEX_ENABLED:
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = SkillIndex()
+        return _index
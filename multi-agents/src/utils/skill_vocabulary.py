@@ -0,0 +1,173 @@
+"""
+Canonical skill vocabulary.
+
+Raw skill phrases from the NER services are mapped to canonical skills through an alias
+dictionary and a token trie (longest match first), and every canonical skill is interned
+as an integer id, so matching CVs against offers is set arithmetic on ints.
+"""
+
+import json
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from src.config.settings import SKILL_ALIASES_PATH
+
+_TOKEN = re.compile(r"[\w+#.]+(?:[/'-][\w+#.]+)*")
+_LIST_SEPARATOR = re.compile(r"[,;\n]")
+_CONJUNCTION = re.compile(r"\s*/\s*|\s+&\s+|\s+(?:et|and)\s+")
+_VERSION = re.compile(r"^v?\d+(?:\.\d+)*(?:\.x)?\+?$")
+_STOPWORDS = {"et", "de", "des", "du", "la", "le", "les", "en", "and", "of", "the", "with", "avec", "a", "à"}
+
+
+def normalize_phrase(phrase: str) -> str:
+    return " ".join(tokenize(phrase))
+
+
+def tokenize(phrase: str) -> List[str]:
+    # Seul le point final est retiré : ".net" garde son point initial
+    return [t.rstrip(".") for t in _TOKEN.findall(phrase.lower()) if t.rstrip(".")]
+
+
+class SkillVocabulary:
+    """Alias trie + interned ids. Ids of the skills listed in the alias file are stable (file order)."""
+
+    def __init__(self, aliases: Dict[str, List[str]]):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._trie: Dict = {}
+        # Texte libre : noms canoniques et alias de plusieurs mots seulement ("rest", "ts", "node" sont trop ambigus)
+        self._prose_trie: Dict = {}
+        # Les mêmes phrases reviennent d'un CV à l'autre
+        self._phrases: Dict[str, Tuple[str, ...]] = {}
+        for canonical, variants in aliases.items():
+            canonical = canonical.strip()
+            self.intern(canonical)
+            for alias in [canonical, *variants]:
+                self._add_alias(self._trie, tokenize(alias), canonical)
+                if alias == canonical or len(tokenize(alias)) > 1:
+                    self._add_alias(self._prose_trie, tokenize(alias), canonical)
+
+    @classmethod
+    def from_file(cls, path: str = SKILL_ALIASES_PATH) -> "SkillVocabulary":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _add_alias(self, trie: Dict, tokens: List[str], canonical: str):
+        node = trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[None] = canonical
+
+    def intern(self, name: str) -> int:
+        skill_id = self._ids.get(name)
+        if skill_id is None:
+            with self._lock:
+                skill_id = self._ids.get(name)
+                if skill_id is None:
+                    skill_id = len(self._names)
+                    self._names.append(name)
+                    self._ids[name] = skill_id
+        return skill_id
+
+    def name(self, skill_id: int) -> str:
+        return self._names[skill_id]
+
+    def get_id(self, name: str) -> Optional[int]:
+        return self._ids.get(name)
+
+    def __len__(self):
+        return len(self._names)
+
+    def canonicalize(self, phrase: str) -> Tuple[str, ...]:
+        """
+        Canonical skills found in one raw phrase.
+
+        An alias only matches a whole phrase, or a whole segment of it: segments are split
+        on commas/semicolons, and on "/", "&", "et", "and" only when every part is a known
+        skill ("jpa/hibernate", "java et python"). Anything else is kept intact as one
+        unknown skill ("spring security" stays whole, never "spring" + "security").
+        Version numbers are dropped ("postgresql 14" -> "postgresql").
+        """
+        cached = self._phrases.get(phrase)
+        if cached is not None:
+            return cached
+
+        skills = []
+        for segment in _LIST_SEPARATOR.split(phrase):
+            skills.extend(self._canonicalize_segment(segment))
+        self._phrases[phrase] = tuple(dict.fromkeys(skills))
+        return self._phrases[phrase]
+
+    def _canonicalize_segment(self, segment: str) -> List[str]:
+        tokens = [t for t in tokenize(segment) if not _VERSION.match(t)]
+        if not tokens:
+            return []
+        canonical = self._whole_match(tokens)
+        if canonical is not None:
+            return [canonical]
+
+        parts = [
+            [t for t in tokenize(part) if not _VERSION.match(t)]
+            for part in _CONJUNCTION.split(segment.lower())
+        ]
+        parts = [p for p in parts if p]
+        if len(parts) > 1:
+            known = [self._whole_match(p) for p in parts]
+            if all(known):
+                return known
+
+        words = [t for t in tokens if t not in _STOPWORDS]
+        return [" ".join(words)] if words else []
+
+    def _whole_match(self, tokens: List[str]) -> Optional[str]:
+        canonical, length = self._longest_match(tokens, 0)
+        return canonical if length == len(tokens) else None
+
+    def mentions(self, text: str) -> Set[str]:
+        """Known canonical skills cited in free text (experience entries); unknown words are ignored."""
+        tokens = tokenize(text)
+        found, i = set(), 0
+        while i < len(tokens):
+            canonical, length = self._longest_match(tokens, i, self._prose_trie)
+            if canonical is not None:
+                found.add(canonical)
+                i += length
+            else:
+                i += 1
+        return found
+
+    def _longest_match(self, tokens: List[str], start: int, trie: Optional[Dict] = None):
+        node, match, length = trie if trie is not None else self._trie, None, 0
+        for offset, token in enumerate(tokens[start:], 1):
+            node = node.get(token)
+            if node is None:
+                break
+            if None in node:
+                match, length = node[None], offset
+        return match, length
+
+    def canonical_names(self, phrases: Iterable[str]) -> List[str]:
+        """Deduplicated canonical skills for a list of raw phrases, in first-seen order."""
+        names = []
+        for phrase in phrases:
+            for name in self.canonicalize(phrase):
+                if name not in names:
+                    names.append(name)
+        return names
+
+    def ids(self, phrases: Iterable[str]) -> Set[int]:
+        return {self.intern(name) for phrase in phrases for name in self.canonicalize(phrase)}
+
+
+_vocabulary = None
+_vocabulary_lock = threading.Lock()
+
+
+def get_skill_vocabulary() -> SkillVocabulary:
+    """Vocabulary built once per process from SKILL_ALIASES_PATH."""
+    global _vocabulary
+    with _vocabulary_lock:
+        if _vocabulary is None:
+            _vocabulary = SkillVocabulary.from_file()
+        return _vocabulary
@@ -0,0 +1,112 @@
+"""
+Request/response encoding for the NER services.
+
+Bodies can be JSON or msgpack (announced with Content-Type, asked for with Accept) and
+request bodies can be gzip- or zstd-compressed (Content-Encoding). Compressed responses
+are decoded by the HTTP client itself; we only advertise what it can decode.
+"""
+
+import gzip
+import json
+import threading
+from typing import Any, Dict, Tuple
+from src.config.settings import NER_WIRE_ENCODING, NER_WIRE_COMPRESSION, NER_WIRE_COMPRESSION_MIN_BYTES
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+MSGPACK_TYPES = (MSGPACK, "application/x-msgpack")
+
+
+def _zstd():
+    import zstandard
+
+    return zstandard
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=5)
+    if encoding == "zstd":
+        return _zstd().ZstdCompressor(level=3).compress(data)
+    raise ValueError(f"Unsupported compression {encoding!r}")
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    if not encoding or encoding == "identity":
+        return data
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "zstd":
+        return _zstd().ZstdDecompressor().decompressobj().decompress(data)
+    raise ValueError(f"Unsupported content encoding {encoding!r}")
+
+
+def dumps(payload: Any, content_type: str) -> bytes:
+    if content_type in MSGPACK_TYPES:
+        import msgpack
+
+        return msgpack.packb(payload, use_bin_type=True)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def loads(body: bytes, content_type: str) -> Any:
+    if content_type.split(";")[0].strip() in MSGPACK_TYPES:
+        import msgpack
+
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body)
+
+
+def accepted_encodings(decodes_zstd: bool = False) -> str:
+    """Accept-Encoding value; zstd only when the HTTP client itself decodes it."""
+    return "zstd, gzip" if decodes_zstd else "gzip"
+
+
+class WireFormat:
+    """
+    Encoding used towards one service. If the service answers 415 to msgpack,
+    `downgrade()` switches this format back to JSON for the rest of the process.
+    """
+
+    def __init__(self, encoding: str = NER_WIRE_ENCODING, compression: str = NER_WIRE_COMPRESSION,
+                 min_size: int = NER_WIRE_COMPRESSION_MIN_BYTES):
+        self.content_type = MSGPACK if encoding == "msgpack" else JSON
+        self.compression = None if compression in ("", "none") else compression
+        self.min_size = min_size
+        self._lock = threading.Lock()
+
+    def encode(self, payload: Any, decodes_zstd: bool = False) -> Tuple[bytes, Dict[str, str]]:
+        content_type = self.content_type
+        body = dumps(payload, content_type)
+        headers = {
+            "Content-Type": content_type,
+            "Accept": f"{MSGPACK}, {JSON};q=0.9" if content_type == MSGPACK else JSON,
+            "Accept-Encoding": accepted_encodings(decodes_zstd),
+        }
+        if self.compression and len(body) >= self.min_size:
+            body = compress(body, self.compression)
+            headers["Content-Encoding"] = self.compression
+        return body, headers
+
+    def decode(self, content_type: str, body: bytes) -> Any:
+        return loads(body, content_type or JSON)
+
+    def downgrade(self) -> bool:
+        with self._lock:
+            if self.content_type == JSON:
+                return False
+            print("Service NER: msgpack refusé (415), retour au JSON.")
+            self.content_type = JSON
+            return True
+
+
+_formats: Dict[str, WireFormat] = {}
+_formats_lock = threading.Lock()
+
+
+def get_wire_format(url: str) -> WireFormat:
+    """Per-service format, so a JSON-only service does not downgrade the others."""
+    with _formats_lock:
+        if url not in _formats:
+            _formats[url] = WireFormat()
+        return _formats[url]
@@ -0,0 +1,48 @@
+"""
+Round-trip of BatchExtractionClient against the local NER stub, for every body encoding
+(JSON, msgpack) and request compression (none, gzip, zstd).
+
+Usage: python test_ner_wire_format.py   (or pytest test_ner_wire_format.py)
+"""
+
+from itertools import product
+from src.utils.ner_batch_client import BatchExtractionClient
+from src.utils.ner_stub_server import start_stub_server
+from src.utils.wire_format import WireFormat
+
+TEXTS = [
+    "Amine Benali amine@example.com Java Spring Boot Docker " * 20,
+    "Sara Idrissi sara@example.com Python Django PostgreSQL",
+    "",
+]
+
+
+def round_trip(encoding: str, compression: str):
+    server = start_stub_server()
+    try:
+        host, port = server.server_address
+        wire = WireFormat(encoding=encoding, compression=compression, min_size=0)
+        client = BatchExtractionClient(url=f"http://{host}:{port}/extract-info/", batch_size=2, wire=wire)
+        results = client.extract(TEXTS)
+    finally:
+        server.shutdown()
+
+    assert len(results) == len(TEXTS), results
+    for text, entities in zip(TEXTS, results):
+        assert "error" not in entities, (encoding, compression, entities)
+        assert entities["FNAME"] == text.split()[:1]
+    assert "java" in results[0]["HSKILL"], results[0]
+    assert "python" in results[1]["HSKILL"], results[1]
+    # Pas de retour silencieux au JSON
+    assert wire.content_type == WireFormat(encoding=encoding).content_type
+
+
+def test_wire_formats():
+    for encoding, compression in product(("json", "msgpack"), ("none", "gzip", "zstd")):
+        round_trip(encoding, compression)
+
+
+if __name__ == "__main__":
+    for encoding, compression in product(("json", "msgpack"), ("none", "gzip", "zstd")):
+        round_trip(encoding, compression)
+        print(f"OK {encoding} / {compression}")